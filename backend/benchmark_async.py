@@ -0,0 +1,86 @@
+"""
+Compare throughput of the WSGI and ASGI read paths.
+
+Start the same project twice, e.g.
+    CACHE_BACKEND=django.core.cache.backends.dummy.DummyCache \
+        gunicorn config.wsgi:application -w 2 -b 127.0.0.1:8000
+    uvicorn config.asgi:application --workers 2 --port 8001
+then run
+    python benchmark_async.py --wsgi http://127.0.0.1:8000 --asgi http://127.0.0.1:8001
+
+The WSGI catalogue views serve repeat requests from the response cache,
+while the async views are uncached, so the WSGI server must run with the
+dummy cache as above or the benchmark measures the cache rather than WSGI
+against ASGI. Responses served from the cache are counted and reported.
+
+Each target gets the same number of GET requests from a pool of concurrent
+clients. Only the standard library is used.
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import URLError
+from urllib.request import urlopen
+
+# (WSGI path, ASGI path) pairs serving the same data
+ENDPOINTS = {
+    'list': ('/api/properties/?page_size=24', '/api/async/properties/?page_size=24'),
+    'settings': ('/api/settings/settings/', '/api/async/settings/settings/'),
+}
+
+
+def fetch(url):
+    started = time.perf_counter()
+    cached = False
+    try:
+        with urlopen(url, timeout=30) as response:
+            response.read()
+            ok = response.status == 200
+            cached = response.headers.get('X-Catalogue-Cache') == 'HIT'
+    except (URLError, OSError):
+        ok = False
+    return time.perf_counter() - started, ok, cached
+
+
+def run(url, requests, concurrency):
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        fetch(url)  # warm up
+        started = time.perf_counter()
+        results = list(pool.map(fetch, [url] * requests))
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, ok, _ in results if ok)
+    errors = sum(1 for _, ok, _ in results if not ok)
+    hits = sum(1 for _, _, cached in results if cached)
+    if not latencies:
+        return f'{url}: all {errors} requests failed'
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+    summary = (
+        f'{url}: {len(latencies) / elapsed:7.1f} req/s, '
+        f'median {statistics.median(latencies) * 1000:6.1f} ms, '
+        f'p95 {p95 * 1000:6.1f} ms, {errors} errors'
+    )
+    if hits:
+        summary += f'\n       {hits} served from the response cache; run this server with the dummy cache'
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--wsgi', default='http://127.0.0.1:8000', help='Base URL of the WSGI server')
+    parser.add_argument('--asgi', default='http://127.0.0.1:8001', help='Base URL of the ASGI server')
+    parser.add_argument('-n', '--requests', type=int, default=500, help='Requests per endpoint and server')
+    parser.add_argument('-c', '--concurrency', type=int, default=50, help='Concurrent clients')
+    parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), action='append', help='Defaults to all')
+    args = parser.parse_args()
+
+    for name in args.endpoint or sorted(ENDPOINTS):
+        wsgi_path, asgi_path = ENDPOINTS[name]
+        print(f'[{name}] {args.requests} requests, {args.concurrency} concurrent')
+        print('  WSGI ' + run(args.wsgi.rstrip('/') + wsgi_path, args.requests, args.concurrency))
+        print('  ASGI ' + run(args.asgi.rstrip('/') + asgi_path, args.requests, args.concurrency))
+
+
+if __name__ == '__main__':
+    main()
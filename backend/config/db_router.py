@@ -0,0 +1,129 @@
+"""
+Read-replica routing.
+
+When a ``replica`` database is configured, reads of the catalogue and site
+settings made while handling a request go to it and everything else,
+including every write and all work outside a request, goes to the primary. A request is pinned to the primary once it writes, and for
+``REPLICA_PIN_SECONDS`` afterwards through a cookie, so a client always
+reads its own writes even while the replica lags. Unsafe methods, orders /
+checkout and the admin are pinned from the start, and so is every request
+for ``REPLICA_PIN_SECONDS`` after a catalogue change: a lagging replica
+would otherwise hand old rows to the response cache, which would store them
+under the new catalogue version.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.utils.decorators import sync_and_async_middleware
+
+from properties.cache import catalogue_changed_within
+
+REPLICA_ALIAS = 'replica'
+
+# Apps whose reads may be served by the replica
+REPLICA_APP_LABELS = {'properties', 'settings_app'}
+
+# Requests under these paths always use the primary
+PRIMARY_PATH_PREFIXES = ('/api/orders/', '/admin/')
+
+PIN_COOKIE = 'db_primary'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class _PinState:
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+_state = ContextVar('replica_pin_state', default=None)
+
+
+def replica_enabled():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def use_primary():
+    """
+    Route every read inside the block to the primary, e.g. for background
+    work that must see rows the request that queued it has just written.
+    """
+    token = _state.set(_PinState(pinned=True))
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not replica_enabled() or model._meta.app_label not in REPLICA_APP_LABELS:
+            return None
+        state = _state.get()
+        # Only requests opt in; management commands, shells and tasks use the primary
+        if state is None or state.pinned:
+            return None
+        return REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            # Read your own writes for the rest of this request and the next few seconds
+            state.pinned = state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+def _begin(request):
+    pinned = (
+        request.method not in SAFE_METHODS
+        or request.path.startswith(PRIMARY_PATH_PREFIXES)
+        or PIN_COOKIE in request.COOKIES
+        or catalogue_changed_within(settings.REPLICA_PIN_SECONDS)
+    )
+    return _state.set(_PinState(pinned=pinned))
+
+
+def _finish(response):
+    state = _state.get()
+    if state is not None and state.wrote:
+        response.set_cookie(
+            PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax'
+        )
+    return response
+
+
+@sync_and_async_middleware
+def ReplicaPinningMiddleware(get_response):
+    """
+    Scope the primary pin to each request and carry it to the next ones.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            if not replica_enabled():
+                return await get_response(request)
+            token = _begin(request)
+            try:
+                return _finish(await get_response(request))
+            finally:
+                _state.reset(token)
+    else:
+        def middleware(request):
+            if not replica_enabled():
+                return get_response(request)
+            token = _begin(request)
+            try:
+                return _finish(get_response(request))
+            finally:
+                _state.reset(token)
+    return middleware
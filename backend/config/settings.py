@@ -67,6 +67,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'config.db_router.ReplicaPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -131,6 +132,59 @@ else:
     }
     print("Using SQLite database")
 
+# Optional read replica for catalogue and settings reads (see config/db_router.py).
+# DATABASE_REPLICA_HOST enables it; the other DATABASE_REPLICA_* values default
+# to the primary's.
+if POSTGRES_READY and os.environ.get('DATABASE_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ.get('DATABASE_REPLICA_NAME', DATABASES['default']['NAME']),
+        'USER': os.environ.get('DATABASE_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.environ.get('DATABASE_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'HOST': os.environ.get('DATABASE_REPLICA_HOST'),
+        'PORT': os.environ.get('DATABASE_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    print("Using read replica for catalogue reads")
+
+DATABASE_ROUTERS = ['config.db_router.ReplicaRouter']
+
+# Seconds a client keeps reading from the primary after it writes
+REPLICA_PIN_SECONDS = int(os.environ.get('DATABASE_REPLICA_PIN_SECONDS', 5))
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory by default, with the catalogue version kept in the mtime of
+# CATALOGUE_VERSION_FILE so every process on the host sees each bump. Set
+# CACHE_BACKEND / CACHE_LOCATION (e.g. the file-based backend and a shared
+# directory) so workers share the cached responses too.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'cedric-default'),
+    }
+}
+
+CATALOGUE_VERSION_FILE = os.environ.get(
+    'CATALOGUE_VERSION_FILE', os.path.join(BASE_DIR, 'cache', 'catalogue-version')
+)
+
+# Background worker pool for property image processing (0 runs tasks inline)
+PROPERTY_WORKERS = int(os.environ.get('PROPERTY_WORKERS', 4))
+PROPERTY_TASK_QUEUE_FACTOR = 8
+
+# API uploads wait here until a worker stores them; recover_image_uploads finishes what a restart cut off
+PROPERTY_UPLOAD_SPOOL_DIR = os.environ.get(
+    'PROPERTY_UPLOAD_SPOOL_DIR', os.path.join(BASE_DIR, 'cache', 'uploads')
+)
+
+# On-disk LRU cache of downscaled plan images for receipt PDFs, shared by all workers
+RECEIPT_THUMBNAIL_CACHE_DIR = os.environ.get(
+    'RECEIPT_THUMBNAIL_CACHE_DIR', os.path.join(BASE_DIR, 'cache', 'receipt_thumbnails')
+)
+RECEIPT_THUMBNAIL_CACHE_MAX_BYTES = int(os.environ.get('RECEIPT_THUMBNAIL_CACHE_MAX_BYTES', 100 * 1024 * 1024))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -11,4 +11,7 @@ urlpatterns = [
     path('api/', include('inquiries.urls')),
     path('api/settings/', include('settings_app.urls')),
     path('api/orders/', include('orders.urls')),
+    # Async read-only mirrors of the catalogue and settings endpoints, for ASGI servers
+    path('api/async/', include('properties.async_urls')),
+    path('api/async/settings/', include('settings_app.async_urls')),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
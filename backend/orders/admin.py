@@ -1,9 +1,16 @@
 from django.contrib import admin
-from .models import Order
+from .models import Order, ReceiptJob
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
     list_display = ('id', 'plan', 'amount', 'status', 'created_at')
     list_filter = ('status', 'created_at')
     search_fields = ('id', 'plan__title', 'yoco_checkout_id')
+    readonly_fields = ('created_at', 'updated_at', 'receipt_file', 'receipt_version')
+
+
+@admin.register(ReceiptJob)
+class ReceiptJobAdmin(admin.ModelAdmin):
+    list_display = ('order', 'status', 'attempts', 'updated_at')
+    list_filter = ('status',)
     readonly_fields = ('created_at', 'updated_at')
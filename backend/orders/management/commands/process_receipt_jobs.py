@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from orders.models import Order, ReceiptJob
+from orders.tasks import run_receipt_job, runnable_jobs
+
+
+class Command(BaseCommand):
+    help = 'Run receipt jobs that are pending, failed with attempts left, or lost with their worker'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backfill', action='store_true',
+            help='First queue a job for every paid order that has none',
+        )
+        parser.add_argument(
+            '--loop', type=float, metavar='SECONDS',
+            help='Keep running, checking for jobs every SECONDS',
+        )
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            orders = Order.objects.filter(status='PAID', receipt_job__isnull=True)
+            created = ReceiptJob.objects.bulk_create([ReceiptJob(order=order) for order in orders])
+            self.stdout.write(f'Queued {len(created)} receipt job(s)')
+
+        while True:
+            done = failed = 0
+            for job_id in list(runnable_jobs().values_list('pk', flat=True)):
+                if run_receipt_job(job_id):
+                    done += 1
+                else:
+                    failed += 1
+            if done or failed or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(f'Rendered {done} receipt(s), {failed} failed or skipped'))
+            if not options['loop']:
+                break
+            time.sleep(options['loop'])
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:02
+
+import orders.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_alter_order_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='receipt_file',
+            field=models.FileField(blank=True, editable=False, storage=orders.models.receipt_storage, upload_to='receipts/'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='receipt_version',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+    ]
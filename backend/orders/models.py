@@ -1,6 +1,20 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
 from django.db import models
 from properties.models import Property
 
+
+def receipt_storage():
+    """
+    Storage for receipt PDFs. Cloudinary's default media storage only takes
+    images, so PDFs go to its raw storage there.
+    """
+    if settings.CLOUDINARY_READY:
+        from cloudinary_storage.storage import RawMediaCloudinaryStorage
+        return RawMediaCloudinaryStorage()
+    return default_storage
+
+
 class Order(models.Model):
     STATUS_CHOICES = (
         ('PENDING', 'Pending'),
@@ -23,6 +37,9 @@ class Order(models.Model):
     # Receipt tracking
     receipt_generated = models.BooleanField(default=False)
     receipt_number = models.CharField(max_length=50, blank=True, null=True, unique=True)
+    # Stored PDF and the fingerprint of the order data it was rendered from
+    receipt_file = models.FileField(upload_to='receipts/', storage=receipt_storage, blank=True, editable=False)
+    receipt_version = models.CharField(max_length=32, blank=True, editable=False)
     
     class Meta:
         verbose_name = "Order ( List of all orders )"
@@ -37,5 +54,34 @@ class Order(models.Model):
             from datetime import datetime
             timestamp = datetime.now().strftime('%Y%m%d')
             self.receipt_number = f"RCP-{timestamp}-{self.id:05d}"
-            self.save()
+            # Write just this column; a full save would rewrite every field and bump updated_at
+            type(self).objects.filter(pk=self.pk).update(receipt_number=self.receipt_number)
         return self.receipt_number
+
+
+class ReceiptJob(models.Model):
+    """
+    Durable record of a queued receipt render, so work lost with a worker
+    process can be picked up again by ``process_receipt_jobs``.
+    """
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    )
+
+    order = models.OneToOneField(Order, on_delete=models.CASCADE, related_name='receipt_job')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='receiptjob_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"Receipt job for order #{self.order_id} - {self.status}"
@@ -0,0 +1,101 @@
+"""
+Ahead-of-time receipt rendering.
+
+When an order is paid a ReceiptJob row is written and the render is handed
+to the shared property worker pool, so the receipt is usually ready before
+the customer asks for it. The row makes the queue durable: jobs whose
+worker died are picked up again by ``python manage.py process_receipt_jobs``.
+"""
+from datetime import timedelta
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from properties.tasks import submit_task
+
+from .models import ReceiptJob
+
+RECEIPT_MAX_ATTEMPTS = 3
+
+# RUNNING jobs untouched for this long are assumed lost with their worker
+RECEIPT_JOB_STALE_AFTER = timedelta(minutes=5)
+
+
+def _runnable():
+    """
+    Jobs a worker may claim: pending, failed with attempts left, or RUNNING
+    but untouched long enough that their worker is presumed dead.
+    """
+    stale = timezone.now() - RECEIPT_JOB_STALE_AFTER
+    return (
+        Q(status='PENDING')
+        | Q(status='FAILED', attempts__lt=RECEIPT_MAX_ATTEMPTS)
+        | Q(status='RUNNING', updated_at__lt=stale)
+    )
+
+
+def queue_receipt(order):
+    """
+    Record a receipt job for ``order`` and run it once the transaction commits.
+    """
+    job, created = ReceiptJob.objects.get_or_create(order=order)
+    if not created and job.status == 'DONE':
+        # The order changed after the last render
+        job.status = 'PENDING'
+        job.attempts = 0
+        job.error = ''
+        job.save(update_fields=['status', 'attempts', 'error', 'updated_at'])
+    elif not created:
+        if job.status == 'PENDING' and job.updated_at >= timezone.now() - RECEIPT_JOB_STALE_AFTER:
+            # Queued recently; don't pile up duplicate tasks while clients poll
+            return job
+        if not ReceiptJob.objects.filter(_runnable(), pk=job.pk).exists():
+            # Already running, or out of attempts
+            return job
+    transaction.on_commit(partial(submit_task, run_receipt_job, job.pk))
+    return job
+
+
+def run_receipt_job(job_id):
+    """
+    Claim and run one job. A job another worker has claimed is left alone.
+    """
+    from .utils import get_or_generate_receipt
+
+    claimed = ReceiptJob.objects.filter(_runnable(), pk=job_id).update(
+        status='RUNNING', attempts=F('attempts') + 1, updated_at=timezone.now()
+    )
+    if not claimed:
+        return False
+
+    job = ReceiptJob.objects.select_related('order__plan').get(pk=job_id)
+    try:
+        get_or_generate_receipt(job.order)
+    except Exception as e:
+        ReceiptJob.objects.filter(pk=job_id).update(status='FAILED', error=str(e), updated_at=timezone.now())
+        print(f"Receipt job for order #{job.order_id} failed: {e}")
+        return False
+    ReceiptJob.objects.filter(pk=job_id).update(status='DONE', error='', updated_at=timezone.now())
+    return True
+
+
+def runnable_jobs():
+    return ReceiptJob.objects.filter(_runnable())
+
+
+def receipt_status(order):
+    """
+    'ready', 'pending' or 'failed' for a paid order. Queues a job when the
+    stored receipt is missing or stale and no job is under way.
+    """
+    from .utils import stored_receipt
+
+    if stored_receipt(order) is not None:
+        return 'ready'
+    job = queue_receipt(order)
+    job.refresh_from_db()
+    if job.status == 'FAILED' and job.attempts >= RECEIPT_MAX_ATTEMPTS:
+        return 'failed'
+    return 'pending'
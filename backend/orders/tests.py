@@ -1,3 +1,53 @@
+from datetime import timedelta
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+
+from properties.models import Property
+
+from .models import Order, ReceiptJob
+from .tasks import RECEIPT_JOB_STALE_AFTER, RECEIPT_MAX_ATTEMPTS, run_receipt_job, runnable_jobs
+
+
+@mock.patch('orders.utils.get_or_generate_receipt')
+class ReceiptJobTests(TestCase):
+
+    def setUp(self):
+        plan = Property.objects.create(title='Plan', price=1000)
+        order = Order.objects.create(plan=plan, amount=1000, status='PAID')
+        self.job = ReceiptJob.objects.create(order=order)
+
+    def test_pending_job_is_claimed_and_finished(self, render):
+        self.assertTrue(run_receipt_job(self.job.pk))
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.status, self.job.attempts), ('DONE', 1))
+        render.assert_called_once()
+        # A finished job is not claimed again
+        self.assertFalse(run_receipt_job(self.job.pk))
+        self.assertFalse(runnable_jobs().exists())
+
+    def test_running_job_is_left_to_its_worker(self, render):
+        ReceiptJob.objects.filter(pk=self.job.pk).update(status='RUNNING', updated_at=timezone.now())
+        self.assertFalse(run_receipt_job(self.job.pk))
+        render.assert_not_called()
+
+    def test_stale_running_job_is_picked_up(self, render):
+        stale = timezone.now() - RECEIPT_JOB_STALE_AFTER - timedelta(seconds=1)
+        ReceiptJob.objects.filter(pk=self.job.pk).update(status='RUNNING', attempts=1, updated_at=stale)
+        self.assertEqual(list(runnable_jobs()), [self.job])
+        self.assertTrue(run_receipt_job(self.job.pk))
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.status, self.job.attempts), ('DONE', 2))
+
+    def test_failed_job_is_retried_until_out_of_attempts(self, render):
+        render.side_effect = OSError('disk full')
+        for _ in range(RECEIPT_MAX_ATTEMPTS):
+            self.assertFalse(run_receipt_job(self.job.pk))
+            self.job.refresh_from_db()
+            self.assertEqual((self.job.status, self.job.error), ('FAILED', 'disk full'))
 
-# Create your tests here.
+        self.assertEqual(self.job.attempts, RECEIPT_MAX_ATTEMPTS)
+        self.assertFalse(runnable_jobs().exists())
+        self.assertFalse(run_receipt_job(self.job.pk))
+        self.assertEqual(render.call_count, RECEIPT_MAX_ATTEMPTS)
@@ -0,0 +1,141 @@
+"""
+On-disk LRU cache of receipt-sized plan images.
+
+Receipts print the plan's first image at 4 x 3 inches, so a downscaled JPEG
+is all ReportLab needs. Thumbnails are cached in
+``RECEIPT_THUMBNAIL_CACHE_DIR`` under ``<image id>-<updated_at>.jpg``, so a
+replaced image gets a new key. Every worker process on the host shares the
+directory. A hit refreshes the file's mtime. When the directory grows past
+``RECEIPT_THUMBNAIL_CACHE_MAX_BYTES`` the least recently used files are
+removed. Misses read the 1280px JPEG derivative when there is one (the
+smallest at least 800px wide), and fetch remote storage through a pooled
+HTTP session.
+"""
+import glob
+import io
+import os
+import tempfile
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.files.storage import default_storage
+from PIL import Image as PILImage
+from PIL import ImageOps
+
+from properties.images import derivative_path
+
+# Pixels for a 4 x 3 inch image at 200 dpi
+RECEIPT_THUMBNAIL_SIZE = (800, 600)
+RECEIPT_THUMBNAIL_QUALITY = 85
+
+# Derivative width to start from: the smallest one covering RECEIPT_THUMBNAIL_SIZE,
+# since thumbnail() never upscales and larger sources are only decoded to be thrown away
+SOURCE_WIDTH = 1280
+
+# Evict down to this share of the limit, so every miss doesn't trigger a sweep
+EVICT_TO = 0.9
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+
+def _cache_path(property_image):
+    stamp = int(property_image.updated_at.timestamp() * 1000)
+    return os.path.join(settings.RECEIPT_THUMBNAIL_CACHE_DIR, f'{property_image.pk}-{stamp}.jpg')
+
+
+def _read_source(property_image):
+    name = derivative_path(property_image.derivatives, 'jpeg', max_width=SOURCE_WIDTH) or property_image.image.name
+    url = default_storage.url(name)
+    if url.startswith('http'):
+        response = _get_session().get(url, timeout=5)
+        response.raise_for_status()
+        return response.content
+    with default_storage.open(name, 'rb') as source:
+        return source.read()
+
+
+def _write_thumbnail(data, path):
+    img = PILImage.open(io.BytesIO(data))
+    # Let the JPEG decoder skip detail that is about to be thrown away
+    img.draft('RGB', RECEIPT_THUMBNAIL_SIZE)
+    img = ImageOps.exif_transpose(img)
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    img.thumbnail(RECEIPT_THUMBNAIL_SIZE, PILImage.LANCZOS)
+
+    directory = os.path.dirname(path)
+    # Write then rename, so other processes never see a partial file
+    with tempfile.NamedTemporaryFile(dir=directory, suffix='.tmp', delete=False) as tmp:
+        try:
+            img.save(tmp, 'JPEG', quality=RECEIPT_THUMBNAIL_QUALITY, optimize=True)
+        except Exception:
+            tmp.close()
+            os.remove(tmp.name)
+            raise
+    os.replace(tmp.name, path)
+
+
+def _evict(directory, max_bytes):
+    entries = []
+    total = 0
+    for entry in os.scandir(directory):
+        if entry.is_file() and entry.name.endswith('.jpg'):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+    if total <= max_bytes:
+        return
+    for _, size, path in sorted(entries):
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        if total <= max_bytes * EVICT_TO:
+            break
+
+
+def receipt_thumbnail(property_image):
+    """
+    Return the path of a receipt-sized JPEG of ``property_image``, building
+    and caching it on a miss. Returns None if the image can't be read.
+    """
+    if not property_image.image:
+        return None
+    path = _cache_path(property_image)
+    try:
+        os.utime(path)
+        return path
+    except FileNotFoundError:
+        pass
+
+    try:
+        os.makedirs(settings.RECEIPT_THUMBNAIL_CACHE_DIR, exist_ok=True)
+        _write_thumbnail(_read_source(property_image), path)
+    except Exception as e:
+        print(f"Could not cache receipt thumbnail for image {property_image.pk}: {e}")
+        return None
+
+    # Drop thumbnails of earlier versions of this image
+    for stale in glob.glob(os.path.join(settings.RECEIPT_THUMBNAIL_CACHE_DIR, f'{property_image.pk}-*.jpg')):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    _evict(settings.RECEIPT_THUMBNAIL_CACHE_DIR, settings.RECEIPT_THUMBNAIL_CACHE_MAX_BYTES)
+    return path
@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import CreateCheckoutSessionView, PaymentSuccessView, PaymentCancelView, DownloadReceiptView
+from .views import CreateCheckoutSessionView, PaymentSuccessView, PaymentCancelView, DownloadReceiptView, ReceiptStatusView
 
 urlpatterns = [
     path('checkout/', CreateCheckoutSessionView.as_view(), name='create-checkout'),
     path('success/', PaymentSuccessView.as_view(), name='payment-success'),
     path('cancel/', PaymentCancelView.as_view(), name='payment-cancel'),
     path('<int:order_id>/receipt/', DownloadReceiptView.as_view(), name='download-receipt'),
+    path('<int:order_id>/receipt/status/', ReceiptStatusView.as_view(), name='receipt-status'),
 ]
@@ -1,3 +1,4 @@
+import hashlib
 import io
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib import colors
@@ -6,9 +7,10 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
 from django.conf import settings
+from django.core.files.base import ContentFile
 from datetime import datetime
-import requests
-from PIL import Image as PILImage
+
+from .thumbnails import receipt_thumbnail
 
 
 def generate_receipt_pdf(order):
@@ -103,27 +105,14 @@ def generate_receipt_pdf(order):
     elements.append(plan_heading)
     elements.append(Spacer(1, 0.1*inch))
     
-    # Try to add plan image if available
-    if order.plan.images and len(order.plan.images.all()) > 0:
-        try:
-            # Get first image
-            first_image = order.plan.images.all()[0]
-            image_url = first_image.image.url
-            
-            # Download and add image
-            if image_url.startswith('http'):
-                response = requests.get(image_url, timeout=5)
-                img_buffer = io.BytesIO(response.content)
-            else:
-                # Local file
-                img_buffer = first_image.image.path
-            
-            img = Image(img_buffer, width=4*inch, height=3*inch)
+    # Add the plan's first image, from the local receipt thumbnail cache
+    first_image = order.plan.images.first()
+    if first_image:
+        thumbnail = receipt_thumbnail(first_image)
+        if thumbnail:
+            img = Image(thumbnail, width=4*inch, height=3*inch)
             elements.append(img)
             elements.append(Spacer(1, 0.2*inch))
-        except Exception as e:
-            print(f"Could not add image to PDF: {e}")
-            # Continue without image
     
     # Plan Information Table
     plan_data = [
@@ -208,10 +197,72 @@ def generate_receipt_pdf(order):
     # Build PDF
     doc.build(elements)
     
-    # Mark receipt as generated
-    order.receipt_generated = True
-    order.save()
-    
     # Get the PDF value
     buffer.seek(0)
     return buffer
+
+
+# Bump when the receipt layout changes so stored PDFs are rebuilt
+RECEIPT_LAYOUT_VERSION = 1
+
+
+def receipt_version(order):
+    """
+    Fingerprint of everything printed on the receipt. The plan's updated_at
+    also moves when its images change.
+    """
+    plan = order.plan
+    parts = [
+        RECEIPT_LAYOUT_VERSION, order.receipt_number, order.status, order.amount,
+        order.customer_email, order.created_at.isoformat(), plan.pk, plan.updated_at.isoformat(),
+    ]
+    return hashlib.md5('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def receipt_path(order, version):
+    return f"receipts/{order.receipt_number}-{version[:12]}.pdf"
+
+
+def stored_receipt(order):
+    """
+    The stored receipt PDF of ``order`` if it matches the current order data.
+    """
+    if not order.receipt_file or not order.receipt_number:
+        return None
+    if order.receipt_version != receipt_version(order):
+        return None
+    return order.receipt_file
+
+
+def get_or_generate_receipt(order):
+    """
+    Return the stored receipt PDF for ``order`` (a FieldFile), rendering and
+    storing it first if it is missing or the order changed since.
+    """
+    from .models import Order
+
+    order.generate_receipt_number()
+    version = receipt_version(order)
+    if order.receipt_file and order.receipt_version == version:
+        return order.receipt_file
+
+    storage = order.receipt_file.storage
+    name = receipt_path(order, version)
+    if not storage.exists(name):
+        pdf_buffer = generate_receipt_pdf(order)
+        name = storage.save(name, ContentFile(pdf_buffer.getvalue()))
+
+    previous = order.receipt_file.name
+    order.receipt_file.name = name
+    order.receipt_version = version
+    order.receipt_generated = True
+    Order.objects.filter(pk=order.pk).update(
+        receipt_file=name, receipt_version=version, receipt_generated=True
+    )
+
+    if previous and previous != name:
+        try:
+            storage.delete(previous)
+        except Exception as e:
+            print(f"Could not delete old receipt {previous}: {e}")
+    return order.receipt_file
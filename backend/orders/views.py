@@ -4,8 +4,10 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
+from properties.counters import record_checkout
 from properties.models import Property
 from .models import Order
+from .tasks import queue_receipt, receipt_status
 from .serializers import OrderSerializer
 
 # Import Yoco keys from settings
@@ -14,6 +16,9 @@ from django.conf import settings
 YOCO_SECRET_KEY = settings.YOCO_SECRET_KEY
 YOCO_PUBLIC_KEY = settings.YOCO_PUBLIC_KEY
 
+# Seconds clients should wait before polling for a receipt again
+RECEIPT_RETRY_AFTER = 2
+
 class CreateCheckoutSessionView(APIView):
     def post(self, request):
         plan_id = request.data.get('plan_id')
@@ -27,6 +32,7 @@ class CreateCheckoutSessionView(APIView):
             status='PENDING',
             customer_email=customer_email
         )
+        record_checkout(plan.id)
         
         # Prepare Yoco Checkout payload
         # Note: Amount should be in cents for Yoco, but let's check docs. 
@@ -112,9 +118,14 @@ class PaymentSuccessView(APIView):
         order = get_object_or_404(Order, id=order_id)
         
         # We could verify with Yoco API here if needed
+        newly_paid = order.status != 'PAID'
         order.status = 'PAID'
         order.save()
         
+        # Render the receipt in the background so it is ready when the customer asks for it
+        if newly_paid:
+            queue_receipt(order)
+        
         return Response({'status': 'Order marked as paid'})
 
 class PaymentCancelView(APIView):
@@ -133,13 +144,15 @@ class DownloadReceiptView(APIView):
     
     def get(self, request, order_id):
         """
-        Generate and download PDF receipt for a paid order
+        Stream the stored PDF receipt of a paid order. If the background job
+        has not rendered it yet, answer 202 with Retry-After; poll
+        ReceiptStatusView or retry the download.
         """
-        from django.http import HttpResponse
-        from .utils import generate_receipt_pdf
+        from django.http import FileResponse
+        from .utils import stored_receipt
         
         # Get the order
-        order = get_object_or_404(Order, id=order_id)
+        order = get_object_or_404(Order.objects.select_related('plan'), id=order_id)
         
         # Only allow receipt download for paid orders
         if order.status != 'PAID':
@@ -148,30 +161,46 @@ class DownloadReceiptView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Generate PDF
-        try:
-            pdf_buffer = generate_receipt_pdf(order)
-            
-            # Read the PDF content
-            pdf_content = pdf_buffer.read()
-            
-            # Return PDF as downloadable file
-            response = HttpResponse(
-                pdf_content,
-                content_type='application/pdf'
-            )
-            response['Content-Disposition'] = f'attachment; filename="receipt_{order.receipt_number}.pdf"'
-            response['Content-Length'] = len(pdf_content)
-            
-            return response
-            
-        except Exception as e:
-            import traceback
-            print(f"Error generating PDF: {e}")
-            print(traceback.format_exc())
+        receipt = stored_receipt(order)
+        if receipt is not None:
+            try:
+                # Stream the stored file
+                return FileResponse(
+                    receipt.open('rb'),
+                    as_attachment=True,
+                    filename=f"receipt_{order.receipt_number}.pdf",
+                    content_type='application/pdf'
+                )
+            except FileNotFoundError:
+                # Stored copy went missing; render it again
+                Order.objects.filter(pk=order.pk).update(receipt_version='')
+                order.receipt_version = ''
+        
+        return _receipt_status_response(order, receipt_status(order))
+
+class ReceiptStatusView(APIView):
+    permission_classes = []
+    
+    def get(self, request, order_id):
+        """
+        Report whether the receipt of a paid order is ready to download
+        """
+        order = get_object_or_404(Order.objects.select_related('plan'), id=order_id)
+        if order.status != 'PAID':
             return Response(
-                {'error': f'Failed to generate receipt: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {'error': 'Receipt can only be generated for paid orders'},
+                status=status.HTTP_400_BAD_REQUEST
             )
+        return _receipt_status_response(order, receipt_status(order))
 
-
+def _receipt_status_response(order, receipt_state):
+    if receipt_state == 'ready':
+        return Response({'status': 'ready'})
+    if receipt_state == 'failed':
+        return Response(
+            {'status': 'failed', 'error': 'Failed to generate receipt'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    response = Response({'status': 'pending'}, status=status.HTTP_202_ACCEPTED)
+    response['Retry-After'] = str(RECEIPT_RETRY_AFTER)
+    return response
@@ -1,8 +1,10 @@
 from django.contrib import admin
 from django import forms
+from django.core.files.storage import default_storage
 from django.utils.html import format_html
 from django_json_widget.widgets import JSONEditorWidget
 from .models import Property, PropertyImage
+from .images import derivative_path
 from .widgets import DynamicTagWidget
 from .room_spec_widget import RoomSpecificationWidget
 
@@ -15,10 +17,10 @@ class PropertyAdminForm(forms.ModelForm):
         model = Property
         fields = '__all__'
         widgets = {
-            'styles': DynamicTagWidget(placeholder='Add a style (e.g., Modern)'),
-            'features': DynamicTagWidget(placeholder='Add a feature (e.g., Open Plan)'),
-            'amenities': DynamicTagWidget(placeholder='Add an amenity (e.g., Swimming Pool)'),
-            'floors': DynamicTagWidget(placeholder='Add a floor (e.g., Ground Floor)'),
+            'styles': DynamicTagWidget(placeholder='Add a style (e.g., Modern)', tag_kind='STYLE'),
+            'features': DynamicTagWidget(placeholder='Add a feature (e.g., Open Plan)', tag_kind='FEATURE'),
+            'amenities': DynamicTagWidget(placeholder='Add an amenity (e.g., Swimming Pool)', tag_kind='AMENITY'),
+            'floors': DynamicTagWidget(placeholder='Add a floor (e.g., Ground Floor)', tag_kind='FLOOR'),
             'room_specifications': RoomSpecificationWidget(),
         }
     
@@ -92,9 +94,11 @@ class PropertyImageInline(admin.TabularInline):
         Display a thumbnail preview of the uploaded image.
         """
         if obj.image:
+            # Prefer the smallest generated derivative over the full-size upload
+            thumbnail = derivative_path(obj.derivatives, 'jpeg', max_width=320)
             return format_html(
                 '<img src="{}" style="max-height: 100px; max-width: 150px; object-fit: cover; border-radius: 4px;" />',
-                obj.image.url
+                default_storage.url(thumbnail) if thumbnail else obj.image.url
             )
         return "No image"
     
@@ -163,10 +167,11 @@ class PropertyAdmin(admin.ModelAdmin):
             'fields': ('video_url',)
         }),
         ('Display Options', {
-            'fields': ('is_new', 'is_popular'),
+            'fields': ('is_new', 'is_popular', ('view_count', 'checkout_count', 'popularity')),
             'classes': ('collapse',)
         }),
     )
+    readonly_fields = ('view_count', 'checkout_count', 'popularity')
     
     inlines = [PropertyImageInline]
     
@@ -0,0 +1,7 @@
+from django.urls import path
+from .async_views import property_detail, property_list
+
+urlpatterns = [
+    path('properties/', property_list, name='async-property-list'),
+    path('properties/<int:pk>/', property_detail, name='async-property-detail'),
+]
@@ -0,0 +1,106 @@
+"""
+Async read-only catalogue endpoints for ASGI deployments.
+
+These mirror the list and detail reads of PropertyViewSet with plain async
+Django views and the async ORM, so a slow database round trip suspends a
+coroutine instead of holding a worker thread. They return the same
+serializers' output; the list is paginated with a simple newest-first
+keyset cursor (``?cursor=``) rather than DRF's cursor pagination.
+"""
+import base64
+
+from asgiref.sync import sync_to_async
+from django.db.models import Prefetch, Q
+from django.http import JsonResponse
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+from .counters import record_view
+from .filters import filter_properties
+from .models import Property
+from .pagination import PropertyCursorPagination
+from .search import search_properties
+from .serializers import PropertyListSerializer, PropertySerializer
+
+
+def _encode_cursor(prop):
+    raw = f'{prop.created_at.isoformat()}|{prop.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor):
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        created_at = parse_datetime(created_at)
+        if created_at is None:
+            raise ValueError
+        return created_at, int(pk)
+    except ValueError:
+        raise ValidationError({'cursor': 'Invalid cursor.'})
+
+
+def _page_size(params):
+    try:
+        size = int(params.get('page_size', PropertyCursorPagination.page_size))
+    except ValueError:
+        size = PropertyCursorPagination.page_size
+    return max(1, min(size, PropertyCursorPagination.max_page_size))
+
+
+def _catalogue_queryset(params):
+    queryset = Property.objects.all()
+    if params.get('category'):
+        queryset = queryset.filter(category=params['category'])
+    if params.get('search'):
+        queryset = search_properties(queryset, params['search'])
+    return filter_properties(queryset, params)
+
+
+@require_GET
+async def property_list(request):
+    """
+    Catalogue cards, newest first. Accepts the same filters as /api/properties/.
+    """
+    params = request.GET
+    try:
+        if params.get('search'):
+            # Search setup may introspect the database, which is sync-only
+            queryset = await sync_to_async(_catalogue_queryset)(params)
+        else:
+            queryset = _catalogue_queryset(params)
+        cursor = _decode_cursor(params['cursor']) if params.get('cursor') else None
+    except ValidationError as e:
+        return JsonResponse(e.detail, status=400)
+
+    if cursor:
+        created_at, pk = cursor
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+
+    size = _page_size(params)
+    images = Prefetch('images', to_attr='card_images')
+    page = [prop async for prop in queryset.prefetch_related(images).order_by('-created_at', '-id')[:size + 1]]
+
+    next_url = None
+    if len(page) > size:
+        page = page[:size]
+        query = params.copy()
+        query['cursor'] = _encode_cursor(page[-1])
+        next_url = request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+
+    serializer = PropertyListSerializer(page, many=True, context={'request': Request(request)})
+    return JsonResponse({'next': next_url, 'results': serializer.data})
+
+
+@require_GET
+async def property_detail(request, pk):
+    try:
+        prop = await Property.objects.prefetch_related('images').aget(pk=pk)
+    except Property.DoesNotExist:
+        return JsonResponse({'detail': 'No Property matches the given query.'}, status=404)
+
+    # Flushing the counters may write to the database, so keep it off the event loop
+    await sync_to_async(record_view)(pk)
+    serializer = PropertySerializer(prop, context={'request': Request(request)})
+    return JsonResponse(serializer.data)
@@ -0,0 +1,166 @@
+"""
+Catalogue versioning for cached property data.
+
+Every cached value derived from the catalogue is keyed by the current
+catalogue version. The Property signals bump the version on save and
+delete, which invalidates every such entry at once without having to know
+which keys exist.
+
+The version normally lives in the cache. A local-memory cache is private to
+each process, though, so a bump from a management command or another worker
+would never reach the process serving requests. With that backend the
+version is the modification time (in nanoseconds) of
+``CATALOGUE_VERSION_FILE`` instead, which every process on the host shares
+for the cost of a ``stat``.
+"""
+import hashlib
+import os
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+CATALOGUE_VERSION_KEY = 'properties:catalogue-version'
+CATALOGUE_CHANGED_AT_KEY = 'properties:catalogue-changed-at'
+
+# Versioned keys never go stale, this only bounds how long dead entries linger
+CATALOGUE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _version_file():
+    if settings.CACHES['default']['BACKEND'] == 'django.core.cache.backends.locmem.LocMemCache':
+        return settings.CATALOGUE_VERSION_FILE
+    return None
+
+
+def _touch_version_file(path, minimum_ns=0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a'):
+        pass
+    # Never move backwards, even if the clock does
+    version = max(time.time_ns(), minimum_ns)
+    os.utime(path, ns=(version, version))
+    return version
+
+
+def get_catalogue_version():
+    path = _version_file()
+    if path:
+        try:
+            return os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return _touch_version_file(path)
+
+    version = cache.get(CATALOGUE_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so a version evicted from the cache can never
+        # come back as a number that older entries were stored under
+        cache.add(CATALOGUE_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(CATALOGUE_VERSION_KEY)
+    return version
+
+
+def bump_catalogue_version():
+    path = _version_file()
+    if path:
+        try:
+            current = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            current = 0
+        return _touch_version_file(path, current + 1)
+
+    # Recorded first, so whoever sees the new version also knows how recent it is
+    cache.set(CATALOGUE_CHANGED_AT_KEY, time.time(), timeout=CATALOGUE_CACHE_TIMEOUT)
+    try:
+        return cache.incr(CATALOGUE_VERSION_KEY)
+    except ValueError:
+        # Key was evicted or never set; a fresh clock-seeded version retires old entries
+        version = int(time.time() * 1000)
+        cache.set(CATALOGUE_VERSION_KEY, version, timeout=None)
+        return version
+
+
+def catalogue_changed_within(seconds):
+    """
+    Whether the catalogue version was bumped in the last ``seconds`` seconds.
+    """
+    path = _version_file()
+    if path:
+        try:
+            changed_at = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return False
+    else:
+        changed_at = cache.get(CATALOGUE_CHANGED_AT_KEY)
+    return changed_at is not None and time.time() - changed_at < seconds
+
+
+def catalogue_cache_key(prefix, params, ignore=(), extra=''):
+    """
+    Build a cache key from ``prefix``, the catalogue version and the query
+    parameters in ``params`` (a QueryDict), ignoring the names in ``ignore``.
+    ``extra`` is folded into the digest for anything else the value depends on.
+    """
+    items = sorted(
+        (name, value)
+        for name in params
+        if name not in ignore
+        for value in params.getlist(name)
+    )
+    digest = hashlib.md5(f'{extra}|{urlencode(items)}'.encode('utf-8')).hexdigest()
+    return f'properties:{prefix}:v{get_catalogue_version()}:{digest}'
+
+
+# Response headers replayed from a cached response; Vary keeps shared caches
+# from mixing up the JSON and browsable-API renderings of one URL
+CACHED_RESPONSE_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control', 'Vary')
+
+
+def response_cache_key(request):
+    """
+    Key a rendered response by path, query string, negotiated format and
+    catalogue version.
+    """
+    extra = f"{request.path}|{request.META.get('HTTP_ACCEPT', '')}"
+    return catalogue_cache_key('response', request.GET, extra=extra)
+
+
+def get_cached_response(request, key):
+    """
+    Rebuild a response from the bytes stored under ``key``, honouring
+    conditional request headers. Returns None on a miss.
+    """
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    response = HttpResponse(entry['content'], content_type=entry['content_type'])
+    for header, value in entry['headers'].items():
+        response[header] = value
+    response['X-Catalogue-Cache'] = 'HIT'
+    return get_conditional_response(
+        request,
+        etag=entry['headers'].get('ETag'),
+        last_modified=entry['last_modified'],
+        response=response,
+    )
+
+
+def store_response(key, response):
+    """
+    Cache the rendered bytes of a successful JSON response.
+    """
+    if response.status_code != 200 or response.streaming:
+        return
+    content_type = response.get('Content-Type', '')
+    if not content_type.startswith('application/json'):
+        return
+    cache.set(key, {
+        'content': response.content,
+        'content_type': content_type,
+        'headers': {h: response[h] for h in CACHED_RESPONSE_HEADERS if h in response},
+        'last_modified': parse_http_date_safe(response.get('Last-Modified', '')),
+    }, CATALOGUE_CACHE_TIMEOUT)
@@ -0,0 +1,118 @@
+"""
+Buffered view and checkout counters.
+
+Requests only bump an in-process tally; ``flush_counters`` writes the tallies
+in a few ``UPDATE ... SET view_count = view_count + n`` statements, one per
+distinct increment rather than one per property or per request. A flush is
+handed to the worker pool once ``COUNTER_FLUSH_INTERVAL`` seconds have passed
+or ``COUNTER_FLUSH_THRESHOLD`` hits are pending, and once more at exit.
+
+The updates go through the queryset, so they fire no signals, leave
+``updated_at`` alone and do not bump the catalogue version: counting a view
+never invalidates cached responses. Hits still buffered when a process is
+killed are lost, which is acceptable for a popularity ranking.
+"""
+import atexit
+import threading
+import time
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+
+from .tasks import submit_task
+
+# A checkout says far more about interest than a page view
+CHECKOUT_WEIGHT = 25
+
+COUNTER_FLUSH_INTERVAL = 10.0
+COUNTER_FLUSH_THRESHOLD = 500
+
+_pending = defaultdict(lambda: [0, 0])  # property id -> [views, checkouts]
+_pending_hits = 0
+_last_flush = time.monotonic()
+_flush_scheduled = False
+_lock = threading.Lock()
+
+
+def _record(property_id, views=0, checkouts=0):
+    global _pending_hits, _flush_scheduled
+    with _lock:
+        counts = _pending[int(property_id)]
+        counts[0] += views
+        counts[1] += checkouts
+        _pending_hits += 1
+        due = (
+            _pending_hits >= COUNTER_FLUSH_THRESHOLD
+            or time.monotonic() - _last_flush >= COUNTER_FLUSH_INTERVAL
+        )
+        if not due or _flush_scheduled:
+            return
+        _flush_scheduled = True
+    submit_task(flush_counters)
+
+
+def record_view(property_id):
+    _record(property_id, views=1)
+
+
+def record_checkout(property_id):
+    _record(property_id, checkouts=1)
+
+
+def _take_pending():
+    global _pending, _pending_hits, _last_flush, _flush_scheduled
+    with _lock:
+        pending = _pending
+        _pending = defaultdict(lambda: [0, 0])
+        _pending_hits = 0
+        _last_flush = time.monotonic()
+        _flush_scheduled = False
+    return pending
+
+
+def _restore_pending(pending):
+    with _lock:
+        for property_id, (views, checkouts) in pending.items():
+            counts = _pending[property_id]
+            counts[0] += views
+            counts[1] += checkouts
+
+
+def flush_counters():
+    """
+    Write the buffered counts, grouping properties that received the same
+    increments into one UPDATE. Returns the number of statements issued.
+    """
+    from .models import Property
+
+    pending = _take_pending()
+    if not pending:
+        return 0
+
+    groups = defaultdict(list)
+    for property_id, (views, checkouts) in pending.items():
+        groups[(views, checkouts)].append(property_id)
+
+    try:
+        with transaction.atomic():
+            for (views, checkouts), property_ids in groups.items():
+                Property.objects.filter(pk__in=property_ids).update(
+                    view_count=F('view_count') + views,
+                    checkout_count=F('checkout_count') + checkouts,
+                    popularity=F('popularity') + views + CHECKOUT_WEIGHT * checkouts,
+                )
+    except Exception as e:
+        # Keep the counts for the next flush rather than dropping them
+        print(f"Could not flush property counters: {e}")
+        _restore_pending(pending)
+        return 0
+    return len(groups)
+
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        flush_counters()
+    except Exception:
+        pass
@@ -0,0 +1,72 @@
+"""
+Streaming exports of the property catalogue for partner and product feeds.
+
+Rows are read in ``.iterator()`` chunks (with images prefetched per chunk)
+and encoded one at a time, so memory use does not grow with the catalogue.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_CHUNK_SIZE = 500
+
+EXPORT_FIELDS = [
+    'id', 'title', 'category', 'price', 'bedrooms', 'bathrooms', 'garage',
+    'floor_area', 'levels', 'width', 'depth', 'styles', 'features', 'amenities',
+    'floors', 'room_specifications', 'is_new', 'is_popular', 'description',
+    'video_url', 'en_suite', 'lounges', 'dining_areas', 'garage_parking',
+    'covered_parking', 'pet_friendly', 'created_at', 'updated_at', 'image_urls',
+]
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def export_rows(queryset, build_url):
+    """
+    Yield one plain dict per property. ``build_url`` turns a storage URL into
+    the absolute URL written to the feed.
+    """
+    queryset = queryset.prefetch_related('images')
+    for prop in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        row = {name: getattr(prop, name) for name in EXPORT_FIELDS if name != 'image_urls'}
+        row['image_urls'] = [build_url(img.image.url) for img in prop.images.all() if img.image]
+        yield row
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+
+class _Echo:
+    """
+    File-like object whose write() hands the line back to csv.writer's caller.
+    """
+    def write(self, value):
+        return value
+
+
+def _csv_value(value, encoder=DjangoJSONEncoder()):
+    # Lists and objects are written as JSON; decimals and datetimes as text
+    if isinstance(value, (list, dict)):
+        return encoder.encode(value)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return encoder.default(value)
+
+
+def iter_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow([_csv_value(row[name]) for name in EXPORT_FIELDS])
+
+
+EXPORT_FORMATS = {
+    'ndjson': iter_ndjson,
+    'csv': iter_csv,
+}
@@ -0,0 +1,102 @@
+from django.db.models import Count, F, FloatField, IntegerField, Max, Min, Value
+from django.db.models.functions import Cast, Floor, Least
+
+from .filters import filter_properties
+from .models import PropertyTag
+
+# Sidebar facets counted per exact value
+COUNT_FACETS = ('bedrooms', 'bathrooms', 'garage', 'levels')
+
+# Range facets and the filters that narrow them
+RANGE_FACETS = {
+    'price': ('price_min', 'price_max'),
+    'floor_area': ('floor_area_min', 'floor_area_max'),
+}
+
+HISTOGRAM_BUCKETS = 20
+MAX_HISTOGRAM_BUCKETS = 100
+
+
+def compute_facets(queryset, params):
+    """
+    Count the catalogue per sidebar option for the filters in ``params``.
+
+    Each facet ignores its own filter, so selecting "3 bedrooms" still shows
+    how many plans have 2, 4 or 5. Everything runs as grouped aggregates.
+    """
+    facets = {}
+
+    for field in COUNT_FACETS:
+        rows = (
+            filter_properties(queryset, params, exclude=(field,))
+            .order_by()
+            .values(field)
+            .annotate(count=Count('id'))
+            .order_by(field)
+        )
+        facets[field] = [{'value': row[field], 'count': row['count']} for row in rows]
+
+    style_rows = (
+        PropertyTag.objects
+        .filter(tag__kind='STYLE', property__in=filter_properties(queryset, params, exclude=('styles',)).values('pk'))
+        .values('tag__name')
+        .annotate(count=Count('property_id'))
+        .order_by('-count', 'tag__name')
+    )
+    facets['styles'] = [{'value': row['tag__name'], 'count': row['count']} for row in style_rows]
+
+    for field, range_params in RANGE_FACETS.items():
+        bounds = filter_properties(queryset, params, exclude=range_params).aggregate(
+            min=Min(field), max=Max(field)
+        )
+        facets[field] = bounds
+
+    facets['total'] = filter_properties(queryset, params).count()
+    return facets
+
+
+def compute_histograms(queryset, params, buckets=HISTOGRAM_BUCKETS):
+    """
+    Equal-width histograms of price and floor area for the range sliders.
+
+    Like the range facets, each histogram ignores its own range filter but
+    respects every other filter. Per field, one query finds the bounds and
+    one grouped aggregate counts the rows in each bucket.
+    """
+    histograms = {}
+    for field, range_params in RANGE_FACETS.items():
+        filtered = filter_properties(queryset, params, exclude=range_params).order_by()
+        bounds = filtered.aggregate(min=Min(field), max=Max(field))
+        low, high = bounds['min'], bounds['max']
+        if low is None:
+            histograms[field] = {'min': None, 'max': None, 'buckets': []}
+            continue
+
+        low, high = float(low), float(high)
+        width = (high - low) / buckets
+        if width == 0:
+            counts = {0: filtered.count()}
+            buckets_used = 1
+        else:
+            # The maximum value falls in the last bucket rather than one past it
+            bucket = Least(
+                Cast(Floor((Cast(F(field), FloatField()) - Value(low)) / Value(width)), IntegerField()),
+                Value(buckets - 1),
+            )
+            rows = filtered.annotate(bucket=bucket).values('bucket').annotate(count=Count('pk'))
+            counts = {row['bucket']: row['count'] for row in rows}
+            buckets_used = buckets
+
+        histograms[field] = {
+            'min': bounds['min'],
+            'max': bounds['max'],
+            'buckets': [
+                {
+                    'min': round(low + index * width, 2),
+                    'max': round(low + (index + 1) * width, 2) if width else high,
+                    'count': counts.get(index, 0),
+                }
+                for index in range(buckets_used)
+            ],
+        }
+    return histograms
@@ -0,0 +1,89 @@
+from django.db.models import Exists, OuterRef
+from rest_framework.exceptions import ValidationError
+
+from .models import PropertyRoom, PropertyTag
+from .rooms import normalize_room_name
+from .tags import tag_slug
+
+
+# Query parameters understood by filter_properties, mirroring the
+# FilterSidebar options on the HousePlans / BuiltHomes pages.
+RANGE_FILTERS = {
+    'price_min': ('price', 'gte'),
+    'price_max': ('price', 'lte'),
+    'floor_area_min': ('floor_area', 'gte'),
+    'floor_area_max': ('floor_area', 'lte'),
+}
+
+# Multi-select "at least N" filters: selecting 2 and 3 bedrooms matches
+# every plan with two or more bedrooms, same as the frontend did.
+MINIMUM_FILTERS = ('bedrooms', 'bathrooms', 'garage')
+
+# Tag filters match properties carrying any of the given tags
+TAG_FILTERS = {
+    'styles': 'STYLE',
+    'features': 'FEATURE',
+    'amenities': 'AMENITY',
+}
+
+
+def _parse_number(name, value):
+    try:
+        return float(value) if '.' in value else int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({name: f'"{value}" is not a valid number.'})
+
+
+def _parse_list(params, name):
+    """
+    Read a multi-value parameter given either as ?name=1,2 or ?name=1&name=2.
+    """
+    values = []
+    for raw in params.getlist(name):
+        values.extend(item.strip() for item in raw.split(',') if item.strip())
+    return values
+
+
+def filter_properties(queryset, params, exclude=()):
+    """
+    Apply the catalogue filters in ``params`` (a QueryDict) to ``queryset``.
+
+    Parameters listed in ``exclude`` are skipped, which lets facet counts
+    ignore the filter they are counting.
+    """
+    for name, (field, lookup) in RANGE_FILTERS.items():
+        value = params.get(name)
+        if value and name not in exclude:
+            queryset = queryset.filter(**{f'{field}__{lookup}': _parse_number(name, value)})
+
+    for field in MINIMUM_FILTERS:
+        if field in exclude:
+            continue
+        values = [_parse_number(field, v) for v in _parse_list(params, field)]
+        if values:
+            queryset = queryset.filter(**{f'{field}__gte': min(values)})
+
+    if 'levels' not in exclude:
+        levels = [_parse_number('levels', v) for v in _parse_list(params, 'levels')]
+        if levels:
+            queryset = queryset.filter(levels__in=levels)
+
+    for name, kind in TAG_FILTERS.items():
+        if name in exclude:
+            continue
+        slugs = {tag_slug(value) for value in _parse_list(params, name)}
+        if slugs:
+            queryset = queryset.filter(Exists(PropertyTag.objects.filter(
+                property=OuterRef('pk'), tag__kind=kind, tag__slug__in=slugs,
+            )))
+
+    # Every requested room type must be present, with at least room_min of each
+    rooms = _parse_list(params, 'room')
+    if rooms and 'room' not in exclude:
+        room_min = _parse_number('room_min', params.get('room_min') or '1')
+        for slug in {normalize_room_name(room) for room in rooms}:
+            queryset = queryset.filter(Exists(PropertyRoom.objects.filter(
+                property=OuterRef('pk'), slug=slug, quantity__gte=room_min,
+            )))
+
+    return queryset
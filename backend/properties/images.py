@@ -0,0 +1,218 @@
+"""
+Responsive derivatives for uploaded property images.
+
+Each upload is resized once to a few fixed widths, in WebP and a JPEG
+fallback, and the stored paths are recorded on ``PropertyImage.derivatives``
+so serializers can expose them as ``srcset`` strings. The same pass records
+the intrinsic size and a tiny base64 JPEG placeholder (LQIP).
+"""
+import base64
+import io
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image as PILImage
+from PIL import ImageOps
+
+DERIVATIVE_WIDTHS = (320, 640, 1280)
+
+DERIVATIVE_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+DERIVATIVE_DIR = 'property_images/derivatives'
+
+# Placeholder thumbnails are at most this many pixels on the long side
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+
+
+def _open_source(property_image):
+    with property_image.image.open('rb') as source:
+        img = PILImage.open(source)
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+        img.load()
+    return img
+
+
+def generate_derivatives(property_image, img=None):
+    """
+    Resize ``property_image`` to each derivative width (never upscaling) and
+    save the results to the default storage. Returns the derivatives mapping.
+    """
+    if img is None:
+        img = _open_source(property_image)
+    stem = os.path.splitext(os.path.basename(property_image.image.name))[0]
+
+    widths = [w for w in DERIVATIVE_WIDTHS if w < img.width] or [img.width]
+    derivatives = {'source': property_image.image.name}
+    for key, (pil_format, options) in DERIVATIVE_FORMATS.items():
+        derivatives[key] = {}
+        for width in widths:
+            height = round(img.height * width / img.width)
+            resized = img.resize((width, height), PILImage.LANCZOS) if width != img.width else img
+            buffer = io.BytesIO()
+            resized.save(buffer, pil_format, **options)
+            path = f'{DERIVATIVE_DIR}/{stem}-{width}w.{key}'
+            derivatives[key][str(width)] = default_storage.save(path, ContentFile(buffer.getvalue()))
+    return derivatives
+
+
+def build_placeholder(img):
+    """
+    Return a ``data:`` URI of a blurred thumbnail of ``img``, a few hundred bytes.
+    """
+    thumbnail = img.copy()
+    thumbnail.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), PILImage.BILINEAR)
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, 'JPEG', quality=PLACEHOLDER_QUALITY, optimize=True)
+    return 'data:image/jpeg;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def _derivative_paths(derivatives):
+    return {path for key in DERIVATIVE_FORMATS for path in (derivatives or {}).get(key, {}).values()}
+
+
+def delete_derivatives(derivatives, keep=None):
+    """
+    Delete the files of a derivatives mapping, except those ``keep`` still uses.
+    """
+    for path in _derivative_paths(derivatives) - _derivative_paths(keep):
+        try:
+            default_storage.delete(path)
+        except Exception as e:
+            print(f"Could not delete image derivative {path}: {e}")
+
+
+def build_derivative_fields(property_image):
+    """
+    Store the derivatives of ``property_image`` and return the
+    ``derivatives``, ``width``, ``height`` and ``placeholder`` values to save
+    on its row, or None if the image can't be read. Touches no database rows.
+    """
+    try:
+        img = _open_source(property_image)
+        derivatives = generate_derivatives(property_image, img)
+        placeholder = build_placeholder(img)
+    except FileNotFoundError:
+        # Row points at a file that is not in storage; nothing to resize
+        return None
+    except Exception as e:
+        print(f"Could not generate derivatives for {property_image.image.name}: {e}")
+        return None
+    return {
+        'derivatives': derivatives,
+        'width': img.width,
+        'height': img.height,
+        'placeholder': placeholder,
+    }
+
+
+def init_derivative_worker():
+    """
+    ProcessPoolExecutor initializer: set up Django in a freshly spawned worker.
+    """
+    import django
+    django.setup()
+
+
+def derivative_fields_for(image_id, name):
+    """
+    Worker-process task: build the derivatives of the stored image ``name``
+    and return ``(image_id, fields)``, leaving the row for the parent to save.
+    """
+    from .models import PropertyImage
+
+    return image_id, build_derivative_fields(PropertyImage(pk=image_id, image=name))
+
+
+def ensure_derivatives(property_image, force=False):
+    """
+    Generate derivatives, size and placeholder if the image changed since
+    they were last built, or always with ``force``. Stores the result with a
+    queryset update so no save signals fire again. Returns True if anything
+    was rebuilt.
+    """
+    if not property_image.image:
+        return False
+    current = property_image.derivatives or {}
+    if not force and current.get('source') == property_image.image.name and property_image.placeholder:
+        return False
+
+    fields = build_derivative_fields(property_image)
+    if fields is None:
+        return False
+
+    # A missing old file frees its name for the new one, so don't delete what was just saved
+    delete_derivatives(current, keep=fields['derivatives'])
+    type(property_image).objects.filter(pk=property_image.pk).update(**fields)
+    for name, value in fields.items():
+        setattr(property_image, name, value)
+    return True
+
+
+def derivative_path(derivatives, key, max_width=None):
+    """
+    Return the stored path of the widest ``key`` derivative no wider than
+    ``max_width`` (or the narrowest one if all are wider).
+    """
+    widths = sorted(int(w) for w in (derivatives or {}).get(key, {}))
+    if not widths:
+        return None
+    fitting = [w for w in widths if max_width is None or w <= max_width]
+    width = fitting[-1] if fitting else widths[0]
+    return derivatives[key][str(width)]
+
+
+def spool_path(image_id, filename):
+    return os.path.join(settings.PROPERTY_UPLOAD_SPOOL_DIR, f'{image_id}-{os.path.basename(filename)}')
+
+
+def spool_upload(uploaded_file, image_id):
+    """
+    Copy an upload for PropertyImage ``image_id`` into the spool directory,
+    so a worker can persist it after Django has cleaned up its own upload
+    files. The name carries the image id, so ``recover_image_uploads`` can
+    finish the job if the worker never does.
+    """
+    os.makedirs(settings.PROPERTY_UPLOAD_SPOOL_DIR, exist_ok=True)
+    path = spool_path(image_id, uploaded_file.name)
+    # Write then rename, so recovery never picks up a partial file
+    with tempfile.NamedTemporaryFile(dir=settings.PROPERTY_UPLOAD_SPOOL_DIR, suffix='.tmp', delete=False) as spool:
+        for chunk in uploaded_file.chunks():
+            spool.write(chunk)
+    os.replace(spool.name, path)
+    return path
+
+
+def process_uploaded_image(image_id, spool_path, filename):
+    """
+    Worker task: move a spooled upload into storage, build its derivatives
+    and mark the PropertyImage READY (or FAILED).
+    """
+    from .models import PropertyImage
+
+    try:
+        property_image = PropertyImage.objects.get(pk=image_id)
+        with open(spool_path, 'rb') as spool:
+            property_image.image.save(filename, File(spool), save=False)
+        property_image.status = 'READY'
+        # Saving fires the post_save handlers: derivatives, cache invalidation
+        property_image.save(update_fields=['image', 'status'])
+    except PropertyImage.DoesNotExist:
+        pass
+    except Exception:
+        PropertyImage.objects.filter(pk=image_id).update(status='FAILED')
+        raise
+    finally:
+        try:
+            os.remove(spool_path)
+        except OSError:
+            pass
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from properties.cache import bump_catalogue_version
+from properties.images import ensure_derivatives
+from properties.models import Property, PropertyImage
+
+
+class Command(BaseCommand):
+    help = 'Generate responsive WebP / JPEG derivatives and placeholders for property images that lack them'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Rebuild derivatives even for images that already have them',
+        )
+
+    def handle(self, *args, **options):
+        images = PropertyImage.objects.exclude(image='')
+        total = 0
+        property_ids = set()
+        for property_image in images.iterator(chunk_size=200):
+            if ensure_derivatives(property_image, force=options['force']):
+                total += 1
+                property_ids.add(property_image.property_id)
+
+        if property_ids:
+            # Derivatives are written with queryset updates, which fire no
+            # signals; expire the ETags and cached responses that embed them
+            Property.objects.filter(pk__in=property_ids).update(updated_at=timezone.now())
+            bump_catalogue_version()
+        self.stdout.write(self.style.SUCCESS(f'Built derivatives for {total} image(s)'))
@@ -0,0 +1,43 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from properties.export import EXPORT_FORMATS, export_rows
+from properties.models import Property
+
+
+class Command(BaseCommand):
+    help = 'Stream the property catalogue to a file or stdout as NDJSON or CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--type', choices=sorted(EXPORT_FORMATS), default='ndjson')
+        parser.add_argument('--output', help='File to write (defaults to stdout)')
+        parser.add_argument('--category', choices=[code for code, _ in Property.CATEGORY_CHOICES])
+        parser.add_argument(
+            '--base-url', default='',
+            help='Prefix for relative media URLs, e.g. https://cedricserver.onrender.com',
+        )
+
+    def handle(self, *args, **options):
+        queryset = Property.objects.all()
+        if options['category']:
+            queryset = queryset.filter(category=options['category'])
+
+        base_url = options['base_url'].rstrip('/')
+
+        def build_url(url):
+            return url if url.startswith('http') else f'{base_url}{url}'
+
+        chunks = EXPORT_FORMATS[options['type']](export_rows(queryset, build_url))
+        output = open(options['output'], 'w', newline='', encoding='utf-8') if options['output'] else sys.stdout
+        try:
+            count = 0
+            for chunk in chunks:
+                output.write(chunk)
+                count += 1
+        finally:
+            if options['output']:
+                output.close()
+
+        rows = count - 1 if options['type'] == 'csv' else count
+        self.stderr.write(self.style.SUCCESS(f'Exported {rows} properties'))
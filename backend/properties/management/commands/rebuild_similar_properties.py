@@ -0,0 +1,17 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from properties.models import SimilarProperty
+from properties.similarity import rebuild_similarities
+
+
+class Command(BaseCommand):
+    help = 'Recompute the precomputed "similar plans" neighbours for every property'
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        rebuild_similarities()
+        self.stdout.write(self.style.SUCCESS(
+            f'Stored {SimilarProperty.objects.count()} neighbour links in {time.monotonic() - started:.1f}s'
+        ))
@@ -0,0 +1,67 @@
+import os
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from properties.images import process_uploaded_image
+from properties.models import PropertyImage
+
+
+class Command(BaseCommand):
+    help = 'Finish or fail API image uploads left PENDING by a restart or crash, and delete orphaned spool files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=float, default=10, metavar='MINUTES',
+            help='Only touch uploads pending for at least this long (default 10), so live workers are left alone',
+        )
+
+    def handle(self, *args, **options):
+        minutes = options['older_than']
+        cutoff = time.time() - minutes * 60
+
+        spooled, orphans = {}, []
+        if os.path.isdir(settings.PROPERTY_UPLOAD_SPOOL_DIR):
+            for entry in os.scandir(settings.PROPERTY_UPLOAD_SPOOL_DIR):
+                if not entry.is_file() or entry.stat().st_mtime > cutoff:
+                    continue
+                image_id, _, filename = entry.name.partition('-')
+                if image_id.isdigit() and not entry.name.endswith('.tmp'):
+                    spooled[int(image_id)] = (entry.path, filename)
+                else:
+                    # Partial write from a request that died mid-upload
+                    orphans.append(entry.path)
+
+        stale = PropertyImage.objects.filter(
+            status='PENDING', updated_at__lt=timezone.now() - timedelta(minutes=minutes)
+        )
+        recovered = failed = 0
+        for image_id in list(stale.values_list('pk', flat=True)):
+            spool = spooled.pop(image_id, None)
+            if spool is None:
+                # The upload is gone; let the client see it failed rather than wait forever
+                PropertyImage.objects.filter(pk=image_id, status='PENDING').update(status='FAILED')
+                failed += 1
+                continue
+            try:
+                # Removes the spool file whether it succeeds or not
+                process_uploaded_image(image_id, *spool)
+                recovered += 1
+            except Exception as e:
+                self.stderr.write(f'Image {image_id}: {e}')
+                failed += 1
+
+        # Files whose row was deleted or already finished
+        orphans.extend(path for path, _ in spooled.values())
+        for path in orphans:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Recovered {recovered} upload(s), marked {failed} failed, removed {len(orphans)} orphaned file(s)'
+        ))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0005_alter_property_styles'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['category', 'price'], name='property_category_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['category', 'bedrooms', 'bathrooms'], name='property_category_rooms_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['category', 'floor_area'], name='property_category_area_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['category', 'levels', 'garage'], name='property_category_levels_idx'),
+        ),
+    ]
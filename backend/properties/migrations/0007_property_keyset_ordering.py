@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0006_property_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='property',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': 'Property (Built Homes / House Plans Page)', 'verbose_name_plural': 'Properties (Built Homes / House Plans Page)'},
+        ),
+        migrations.RemoveIndex(
+            model_name='property',
+            name='property_category_price_idx',
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['created_at', 'id'], name='property_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['price', 'id'], name='property_price_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['category', 'created_at', 'id'], name='property_cat_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['category', 'price', 'id'], name='property_cat_price_id_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+from django.db import migrations
+
+# Inlined so later edits to properties.search can't change what this migration does
+FTS_TABLE = 'properties_property_fts'
+SEARCH_VECTOR_COLUMN = 'search_vector'
+
+SQLITE_CREATE_FTS = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    f"USING fts5(title, description, styles, tokenize='porter unicode61')"
+)
+
+POSTGRES_ADD_SEARCH_VECTOR = f"""
+    ALTER TABLE properties_property ADD COLUMN {SEARCH_VECTOR_COLUMN} tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(jsonb_to_tsvector('english', coalesce(styles, '[]'::jsonb), '["string"]'), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    ) STORED
+"""
+POSTGRES_CREATE_SEARCH_INDEX = (
+    f"CREATE INDEX IF NOT EXISTS properties_property_search_idx "
+    f"ON properties_property USING gin ({SEARCH_VECTOR_COLUMN})"
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(POSTGRES_ADD_SEARCH_VECTOR)
+        schema_editor.execute(POSTGRES_CREATE_SEARCH_INDEX)
+    elif vendor == 'sqlite':
+        schema_editor.execute(SQLITE_CREATE_FTS)
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description, styles) "
+            f"SELECT id, title, description, styles FROM properties_property"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS properties_property_search_idx')
+        schema_editor.execute(
+            f'ALTER TABLE properties_property DROP COLUMN IF EXISTS {SEARCH_VECTOR_COLUMN}'
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0007_property_keyset_ordering'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
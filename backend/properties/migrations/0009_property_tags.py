@@ -0,0 +1,81 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+TAG_FIELDS = {
+    'styles': 'STYLE',
+    'features': 'FEATURE',
+    'amenities': 'AMENITY',
+    'floors': 'FLOOR',
+}
+
+
+def backfill_tags(apps, schema_editor):
+    Property = apps.get_model('properties', 'Property')
+    Tag = apps.get_model('properties', 'Tag')
+    PropertyTag = apps.get_model('properties', 'PropertyTag')
+
+    tag_ids = {}
+    links = []
+    for prop in Property.objects.only(*TAG_FIELDS).iterator():
+        for field, kind in TAG_FIELDS.items():
+            for value in getattr(prop, field) or []:
+                if isinstance(value, dict):
+                    value = value.get('name')
+                if not isinstance(value, str) or not value.strip():
+                    continue
+                name = value.strip()
+                slug = slugify(name, allow_unicode=True) or name.lower()
+                if (kind, slug) not in tag_ids:
+                    tag, _ = Tag.objects.get_or_create(kind=kind, slug=slug, defaults={'name': name})
+                    tag_ids[(kind, slug)] = tag.pk
+                links.append(PropertyTag(property_id=prop.pk, tag_id=tag_ids[(kind, slug)]))
+    PropertyTag.objects.bulk_create(links, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0008_property_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('STYLE', 'Style'), ('FEATURE', 'Feature'), ('AMENITY', 'Amenity'), ('FLOOR', 'Floor')], max_length=10)),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(allow_unicode=True, max_length=100)),
+            ],
+            options={
+                'ordering': ['kind', 'name'],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'slug'), name='unique_tag_kind_slug')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PropertyTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='property_tags', to='properties.property')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='property_tags', to='properties.tag')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='tags',
+            field=models.ManyToManyField(blank=True, related_name='properties', through='properties.PropertyTag', to='properties.tag'),
+        ),
+        migrations.AddIndex(
+            model_name='propertytag',
+            index=models.Index(fields=['tag', 'property'], name='propertytag_tag_property_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='propertytag',
+            constraint=models.UniqueConstraint(fields=('property', 'tag'), name='unique_property_tag'),
+        ),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0010_propertyimage_derivatives'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='propertyimage',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Processing'), ('READY', 'Ready'), ('FAILED', 'Failed')], default='READY', editable=False, max_length=10),
+        ),
+    ]
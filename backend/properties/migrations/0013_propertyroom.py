@@ -0,0 +1,70 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:54
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _room_slug(name):
+    key = ' '.join(str(name).lower().split())
+    if key not in ('room', 'rooms'):
+        key = re.sub(r'\s+rooms?$', '', key)
+    if key.endswith('ies') and len(key) > 4:
+        key = key[:-3] + 'y'
+    elif key.endswith('s') and not key.endswith('ss') and len(key) > 3:
+        key = key[:-1]
+    return key
+
+
+def backfill_rooms(apps, schema_editor):
+    Property = apps.get_model('properties', 'Property')
+    PropertyRoom = apps.get_model('properties', 'PropertyRoom')
+
+    rows = []
+    for prop in Property.objects.only('room_specifications').iterator():
+        merged = {}
+        for entry in prop.room_specifications or []:
+            if not isinstance(entry, dict) or not str(entry.get('name', '')).strip():
+                continue
+            quantity = entry.get('quantity')
+            try:
+                quantity = 1 if quantity in (None, '') else int(quantity)
+            except (TypeError, ValueError):
+                quantity = 1
+            if quantity <= 0:
+                continue
+            name = str(entry['name']).strip()
+            slug = _room_slug(name)
+            if slug in merged:
+                merged[slug].quantity += quantity
+            else:
+                merged[slug] = PropertyRoom(property_id=prop.pk, name=name, slug=slug, quantity=quantity)
+        rows.extend(merged.values())
+    PropertyRoom.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0012_similarproperty'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PropertyRoom',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.CharField(max_length=100)),
+                ('quantity', models.PositiveIntegerField(default=1)),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rooms', to='properties.property')),
+            ],
+            options={
+                'ordering': ['property', 'name'],
+                'indexes': [models.Index(fields=['slug', 'quantity', 'property'], name='propertyroom_slug_qty_idx')],
+                'constraints': [models.UniqueConstraint(fields=('property', 'slug'), name='unique_property_room')],
+            },
+        ),
+        migrations.RunPython(backfill_rooms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0014_propertyimage_placeholder'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='checkout_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='popularity',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['popularity', 'id'], name='property_popularity_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['category', 'popularity', 'id'], name='property_cat_popularity_id_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0015_property_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='propertyimage',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -37,23 +37,136 @@ class Property(models.Model):
     covered_parking = models.IntegerField(default=0)
     pet_friendly = models.BooleanField(default=False)
     
+    # Engagement counters, buffered in-process and flushed in batches (see properties.counters).
+    # popularity = view_count + CHECKOUT_WEIGHT * checkout_count and drives ?sort=popular
+    view_count = models.PositiveIntegerField(default=0, editable=False)
+    checkout_count = models.PositiveIntegerField(default=0, editable=False)
+    popularity = models.PositiveIntegerField(default=0, editable=False)
+    
+    # Indexed mirror of styles / features / amenities / floors, kept in sync on save
+    tags = models.ManyToManyField('Tag', through='PropertyTag', related_name='properties', blank=True)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Property (Built Homes / House Plans Page)"
         verbose_name_plural = "Properties (Built Homes / House Plans Page)"
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # Keyset pagination orderings, with id as the tie-breaker
+            models.Index(fields=['created_at', 'id'], name='property_created_id_idx'),
+            models.Index(fields=['price', 'id'], name='property_price_id_idx'),
+            models.Index(fields=['category', 'created_at', 'id'], name='property_cat_created_id_idx'),
+            models.Index(fields=['category', 'price', 'id'], name='property_cat_price_id_idx'),
+            models.Index(fields=['popularity', 'id'], name='property_popularity_id_idx'),
+            models.Index(fields=['category', 'popularity', 'id'], name='property_cat_popularity_id_idx'),
+            # Back the catalogue filters, which are almost always scoped by category
+            models.Index(fields=['category', 'bedrooms', 'bathrooms'], name='property_category_rooms_idx'),
+            models.Index(fields=['category', 'floor_area'], name='property_category_area_idx'),
+            models.Index(fields=['category', 'levels', 'garage'], name='property_category_levels_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
 class PropertyImage(models.Model):
+    STATUS_CHOICES = [
+        ('PENDING', 'Processing'),
+        ('READY', 'Ready'),
+        ('FAILED', 'Failed'),
+    ]
+
     property = models.ForeignKey(Property, related_name='images', on_delete=models.CASCADE)
     image = models.ImageField(upload_to='property_images/')
     order = models.IntegerField(default=0)
+    # Resized WebP / JPEG copies generated on upload, see properties.images
+    derivatives = models.JSONField(default=dict, blank=True, editable=False)
+    # API uploads are stored by a background worker; admin uploads are READY at once
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='READY', editable=False)
+    # Intrinsic size and a tiny inline thumbnail, so clients can reserve space and paint a blur first
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    placeholder = models.TextField(blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['order']
 
     def __str__(self):
         return f"Image for {self.property.title}"
+
+class Tag(models.Model):
+    """
+    Normalized vocabulary for the Property JSON tag lists.
+    """
+    KIND_CHOICES = [
+        ('STYLE', 'Style'),
+        ('FEATURE', 'Feature'),
+        ('AMENITY', 'Amenity'),
+        ('FLOOR', 'Floor'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=100, allow_unicode=True)
+
+    class Meta:
+        ordering = ['kind', 'name']
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'slug'], name='unique_tag_kind_slug'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.name}"
+
+class PropertyTag(models.Model):
+    property = models.ForeignKey(Property, related_name='property_tags', on_delete=models.CASCADE)
+    tag = models.ForeignKey(Tag, related_name='property_tags', on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['property', 'tag'], name='unique_property_tag'),
+        ]
+        indexes = [
+            # Tag filters look up properties by tag
+            models.Index(fields=['tag', 'property'], name='propertytag_tag_property_idx'),
+        ]
+
+class SimilarProperty(models.Model):
+    """
+    Precomputed nearest neighbours of a property, see properties.similarity.
+    """
+    property = models.ForeignKey(Property, related_name='similar_links', on_delete=models.CASCADE)
+    similar = models.ForeignKey(Property, related_name='+', on_delete=models.CASCADE)
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['property', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['property', 'rank'], name='unique_similar_rank'),
+        ]
+
+
+class PropertyRoom(models.Model):
+    """
+    Indexed mirror of Property.room_specifications with normalized room names.
+    """
+    property = models.ForeignKey(Property, related_name='rooms', on_delete=models.CASCADE)
+    name = models.CharField(max_length=100)
+    slug = models.CharField(max_length=100)
+    quantity = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        ordering = ['property', 'name']
+        constraints = [
+            models.UniqueConstraint(fields=['property', 'slug'], name='unique_property_room'),
+        ]
+        indexes = [
+            # Room filters look up properties by room type and minimum quantity
+            models.Index(fields=['slug', 'quantity', 'property'], name='propertyroom_slug_qty_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.quantity} x {self.name}"
@@ -0,0 +1,120 @@
+import json
+from base64 import b64decode, b64encode
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class PropertyCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the property catalogue.
+
+    The cursor encodes the ``(value, id)`` of the row at the edge of the
+    page, and the next page filters on ``value > v OR (value = v AND id > pk)``
+    (mirrored for descending orders), so fetching page 100 costs the same as
+    page 1. Every ordering ends with ``id`` as a tie-breaker, so rows sharing
+    a price, popularity, timestamp or search rank are never skipped or
+    repeated between pages and the last page always has no next link.
+    DRF's own cursor only stores the first ordering field plus an offset,
+    which stops making progress once more than ``offset_cutoff`` rows tie.
+    """
+    page_size = 24
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    # ?sort= values and the ordering each one maps to
+    SORT_ORDERINGS = {
+        'newest': ('-created_at', '-id'),
+        'oldest': ('created_at', 'id'),
+        'price_low': ('price', 'id'),
+        'price_high': ('-price', '-id'),
+        'popular': ('-popularity', '-id'),
+    }
+    ordering = SORT_ORDERINGS['newest']
+
+    # Search results default to relevance order unless a sort is requested
+    RELEVANCE_ORDERING = ('-search_rank', '-id')
+
+    def get_ordering(self, request, queryset, view):
+        sort = request.query_params.get('sort')
+        if sort in self.SORT_ORDERINGS:
+            return self.SORT_ORDERINGS[sort]
+        if 'search_rank' in queryset.query.annotations:
+            return self.RELEVANCE_ORDERING
+        return self.ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        ordering = self.get_ordering(request, queryset, view)
+        self.field = ordering[0].lstrip('-')
+        self.descending = ordering[0].startswith('-')
+
+        cursor = self.decode_cursor(request)
+        self.reverse = bool(cursor and cursor['r'])
+        if self.reverse:
+            # Walk backwards from the cursor, then put the page back in order
+            ordering = tuple(o[1:] if o.startswith('-') else f'-{o}' for o in ordering)
+        queryset = queryset.order_by(*ordering)
+        if cursor:
+            try:
+                queryset = queryset.filter(self._after(cursor['v'], cursor['id']))
+            except (ValidationError, ValueError, TypeError):
+                # The value doesn't fit the ordering field, e.g. a cursor from another sort
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        return self.page
+
+    def _after(self, value, pk):
+        # Rows past (value, pk) in the direction being walked
+        forward = self.descending == self.reverse
+        op = 'gt' if forward else 'lt'
+        return Q(**{f'{self.field}__{op}': value}) | Q(**{self.field: value, f'id__{op}': pk})
+
+    def _link(self, row, reverse):
+        payload = {'v': str(getattr(row, self.field)), 'id': row.pk, 'r': int(reverse)}
+        encoded = b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Walked back past the start; restart from the first page
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._link(self.page[0], reverse=True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(b64decode(encoded.encode(), validate=True))
+            cursor = {'v': cursor['v'], 'id': int(cursor['id']), 'r': bool(cursor['r'])}
+            if not isinstance(cursor['v'], str):
+                raise ValueError
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
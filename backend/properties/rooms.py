@@ -0,0 +1,60 @@
+import re
+
+from .models import PropertyRoom
+
+_ROOM_SUFFIX = re.compile(r'\s+rooms?$')
+
+
+def normalize_room_name(name):
+    """
+    Reduce a room name to a matching key: "Study Room", "study" and
+    "Studies" all become "study".
+    """
+    key = ' '.join(str(name).lower().split())
+    if key not in ('room', 'rooms'):
+        key = _ROOM_SUFFIX.sub('', key)
+    # Singularize the last word
+    if key.endswith('ies') and len(key) > 4:
+        key = key[:-3] + 'y'
+    elif key.endswith('s') and not key.endswith('ss') and len(key) > 3:
+        key = key[:-1]
+    return key
+
+
+def _room_entries(room_specifications):
+    for entry in room_specifications or []:
+        if not isinstance(entry, dict) or not str(entry.get('name', '')).strip():
+            continue
+        quantity = entry.get('quantity')
+        try:
+            # Only a missing quantity means one; an explicit 0 leaves the room out
+            quantity = 1 if quantity in (None, '') else int(quantity)
+        except (TypeError, ValueError):
+            quantity = 1
+        if quantity > 0:
+            yield str(entry['name']).strip(), quantity
+
+
+def sync_property_rooms(properties, using='default'):
+    """
+    Replace the PropertyRoom rows of ``properties`` with their current
+    room_specifications, merging entries that normalize to the same room.
+    """
+    properties = list(properties)
+    if not properties:
+        return
+
+    rows = []
+    for prop in properties:
+        merged = {}
+        for name, quantity in _room_entries(prop.room_specifications):
+            slug = normalize_room_name(name)
+            if slug in merged:
+                merged[slug].quantity += quantity
+            else:
+                merged[slug] = PropertyRoom(property_id=prop.pk, name=name, slug=slug, quantity=quantity)
+        rows.extend(merged.values())
+
+    rooms = PropertyRoom.objects.using(using)
+    rooms.filter(property__in=[prop.pk for prop in properties]).delete()
+    rooms.bulk_create(rows)
@@ -0,0 +1,116 @@
+"""
+Full-text search over the property catalogue.
+
+On Postgres the ``search_vector`` tsvector column (a generated column created
+by migration 0008, so Postgres keeps it current on every write) is matched
+through a GIN index. On the SQLite fallback an FTS5 table mirrors the
+searchable columns and is kept in sync from the Property signals. Any other
+backend falls back to the original ``icontains`` scan.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'properties_property_fts'
+SEARCH_VECTOR_COLUMN = 'search_vector'
+
+# Title matches count most, then styles, then the description
+SQLITE_RANK = f"-bm25({FTS_TABLE}, 10.0, 1.0, 5.0)"
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+_fts_tables = {}
+
+
+def _search_terms(query):
+    return WORD_RE.findall(query.lower())
+
+
+def fts_available(alias):
+    """
+    Return True when the SQLite FTS5 table exists on the ``alias`` database.
+    """
+    connection = connections[alias]
+    if connection.vendor != 'sqlite':
+        return False
+    if alias not in _fts_tables:
+        _fts_tables[alias] = FTS_TABLE in connection.introspection.table_names()
+    return _fts_tables[alias]
+
+
+def search_properties(queryset, query):
+    """
+    Filter ``queryset`` to properties matching ``query`` and annotate each
+    with ``search_rank`` (higher is more relevant).
+    """
+    terms = _search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    vendor = connections[queryset.db].vendor
+
+    if vendor == 'postgresql':
+        # Every term must match; the last one may be a prefix of a longer word
+        tsquery = ' & '.join(terms[:-1] + [f'{terms[-1]}:*'])
+        match_sql = f"properties_property.{SEARCH_VECTOR_COLUMN} @@ to_tsquery('english', %s)"
+        rank_sql = (
+            f"ts_rank(properties_property.{SEARCH_VECTOR_COLUMN}, "
+            f"to_tsquery('english', %s))::double precision"
+        )
+        return queryset.filter(
+            RawSQL(match_sql, (tsquery,), output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(rank_sql, (tsquery,), output_field=FloatField())
+        )
+
+    if fts_available(queryset.db):
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return queryset.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,))
+        ).annotate(
+            search_rank=RawSQL(
+                f"(SELECT {SQLITE_RANK} FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid = properties_property.id)",
+                (match,),
+                output_field=FloatField(),
+            )
+        )
+
+    return queryset.filter(
+        Q(title__icontains=query) |
+        Q(description__icontains=query) |
+        Q(styles__icontains=query)
+    )
+
+
+def index_properties(property_ids, using='default'):
+    """
+    Refresh the SQLite FTS5 rows for ``property_ids``. Postgres keeps its
+    generated column current on its own, so this is a no-op there.
+    """
+    property_ids = list(property_ids)
+    if not property_ids or not fts_available(using):
+        return
+    placeholders = ', '.join(['%s'] * len(property_ids))
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", property_ids)
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description, styles) "
+            f"SELECT id, title, description, styles FROM properties_property "
+            f"WHERE id IN ({placeholders})",
+            property_ids,
+        )
+
+
+def remove_properties(property_ids, using='default'):
+    """
+    Drop the SQLite FTS5 rows for deleted properties.
+    """
+    property_ids = list(property_ids)
+    if not property_ids or not fts_available(using):
+        return
+    placeholders = ', '.join(['%s'] * len(property_ids))
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", property_ids)
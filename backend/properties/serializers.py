@@ -1,12 +1,70 @@
+from functools import partial
+
+from django.core.files.storage import default_storage
+from django.db import transaction
 from rest_framework import serializers
+from .images import process_uploaded_image, spool_upload
 from .models import Property, PropertyImage
+from .tasks import submit_task
+
+class SparseFieldsetMixin:
+    """
+    Restrict the serialized fields with ``?fields=id,title,price`` on reads.
+    Unknown names are ignored.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+        requested = request.query_params.get('fields')
+        if not requested:
+            return
+        allowed = {name.strip() for name in requested.split(',') if name.strip()}
+        for name in set(self.fields) - allowed:
+            self.fields.pop(name)
+
+
+def build_image_url(request, image):
+    if not image:
+        return None
+    if request:
+        return request.build_absolute_uri(image.url)
+    return image.url
+
+
+def build_srcset(request, derivatives, key):
+    """
+    Format the ``key`` derivatives as an HTML srcset ("url 320w, url 640w").
+    """
+    entries = sorted((derivatives or {}).get(key, {}).items(), key=lambda item: int(item[0]))
+    if not entries:
+        return None
+    urls = []
+    for width, path in entries:
+        url = default_storage.url(path)
+        urls.append(f"{request.build_absolute_uri(url) if request else url} {width}w")
+    return ', '.join(urls)
+
 
 class PropertyImageSerializer(serializers.ModelSerializer):
+    srcset = serializers.SerializerMethodField()
+    fallback_srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = PropertyImage
-        fields = ['id', 'image', 'order']
+        fields = [
+            'id', 'image', 'order', 'status', 'width', 'height', 'placeholder',
+            'srcset', 'fallback_srcset'
+        ]
+
+    def get_srcset(self, obj):
+        return build_srcset(self.context.get('request'), obj.derivatives, 'webp')
 
-class PropertySerializer(serializers.ModelSerializer):
+    def get_fallback_srcset(self, obj):
+        return build_srcset(self.context.get('request'), obj.derivatives, 'jpeg')
+
+class PropertySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     images = PropertyImageSerializer(many=True, read_only=True)
     uploaded_images = serializers.ListField(
         child=serializers.ImageField(max_length=1000000, allow_empty_file=False, use_url=False),
@@ -28,20 +86,82 @@ class PropertySerializer(serializers.ModelSerializer):
 
     def get_image_urls(self, obj):
         request = self.context.get('request')
-        urls = []
-        for img in obj.images.all():
-            if img.image:
-                if request:
-                    urls.append(request.build_absolute_uri(img.image.url))
-                else:
-                    urls.append(img.image.url)
-        return urls
+        return [build_image_url(request, img.image) for img in obj.images.all() if img.image]
 
     def create(self, validated_data):
         uploaded_images = validated_data.pop('uploaded_images', [])
         property_obj = Property.objects.create(**validated_data)
         
-        for i, image in enumerate(uploaded_images):
-            PropertyImage.objects.create(property=property_obj, image=image, order=i)
+        # Create PENDING rows in one query; the worker pool stores and resizes
+        # the files so large listings don't hold the request open.
+        image_rows = PropertyImage.objects.bulk_create([
+            PropertyImage(property=property_obj, order=i, status='PENDING')
+            for i in range(len(uploaded_images))
+        ])
+        for row, upload in zip(image_rows, uploaded_images):
+            spool_path = spool_upload(upload, row.pk)
+            transaction.on_commit(
+                partial(submit_task, process_uploaded_image, row.pk, spool_path, upload.name)
+            )
             
         return property_obj
+
+class PropertyListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Compact representation for catalogue cards: the card fields, the cover
+    image's sizes and placeholder, and the plain URLs of every image for the
+    card's photo carousel. The full payload is served by the detail endpoint.
+    """
+    cover_image = serializers.SerializerMethodField()
+    image_urls = serializers.SerializerMethodField()
+    cover_srcset = serializers.SerializerMethodField()
+    cover_fallback_srcset = serializers.SerializerMethodField()
+    cover_width = serializers.SerializerMethodField()
+    cover_height = serializers.SerializerMethodField()
+    cover_placeholder = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Property
+        fields = [
+            'id', 'title', 'category', 'price', 'bedrooms', 'bathrooms', 'garage',
+            'floor_area', 'levels', 'width', 'depth', 'styles', 'is_new', 'is_popular',
+            'video_url', 'created_at', 'cover_image', 'cover_srcset', 'cover_fallback_srcset',
+            'cover_width', 'cover_height', 'cover_placeholder', 'image_urls'
+        ]
+        read_only_fields = fields
+
+    def _images(self, obj):
+        # Views prefetch the images into card_images
+        images = getattr(obj, 'card_images', None)
+        return images if images is not None else obj.images.all()
+
+    def _cover(self, obj):
+        return next(iter(self._images(obj)), None)
+
+    def get_image_urls(self, obj):
+        request = self.context.get('request')
+        return [build_image_url(request, img.image) for img in self._images(obj) if img.image]
+
+    def get_cover_image(self, obj):
+        cover = self._cover(obj)
+        return build_image_url(self.context.get('request'), cover.image) if cover else None
+
+    def get_cover_srcset(self, obj):
+        cover = self._cover(obj)
+        return build_srcset(self.context.get('request'), cover.derivatives, 'webp') if cover else None
+
+    def get_cover_fallback_srcset(self, obj):
+        cover = self._cover(obj)
+        return build_srcset(self.context.get('request'), cover.derivatives, 'jpeg') if cover else None
+
+    def get_cover_width(self, obj):
+        cover = self._cover(obj)
+        return cover.width if cover else None
+
+    def get_cover_height(self, obj):
+        cover = self._cover(obj)
+        return cover.height if cover else None
+
+    def get_cover_placeholder(self, obj):
+        cover = self._cover(obj)
+        return (cover.placeholder or None) if cover else None
@@ -0,0 +1,96 @@
+from django.db import transaction
+from functools import partial
+
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import search
+from .images import delete_derivatives, ensure_derivatives
+from .rooms import sync_property_rooms
+from .tags import sync_property_tags
+from .tasks import submit_task
+from .cache import bump_catalogue_version
+from .models import Property, PropertyImage, SimilarProperty
+from .similarity import refresh_similarities
+
+
+@receiver(post_save, sender=Property)
+def update_search_index(sender, instance, using, **kwargs):
+    """
+    Keep the SQLite full-text table in step with the saved property.
+    """
+    search.index_properties([instance.pk], using=using)
+
+
+@receiver(post_save, sender=Property)
+def update_property_tags(sender, instance, using, **kwargs):
+    """
+    Mirror the styles / features / amenities / floors lists into PropertyTag.
+    """
+    sync_property_tags([instance], using=using)
+
+
+@receiver(post_save, sender=Property)
+def update_property_rooms(sender, instance, using, **kwargs):
+    """
+    Mirror room_specifications into the indexed PropertyRoom table.
+    """
+    sync_property_rooms([instance], using=using)
+
+
+@receiver(post_save, sender=Property)
+def update_similar_properties(sender, instance, raw=False, **kwargs):
+    """
+    Refresh the precomputed neighbours on the worker pool once the save commits.
+    """
+    if not raw:
+        transaction.on_commit(partial(submit_task, refresh_similarities, [instance.pk]))
+
+
+@receiver(pre_delete, sender=Property)
+def update_similar_properties_on_delete(sender, instance, **kwargs):
+    # The cascade removes the links, so collect who listed this property first
+    dependents = list(SimilarProperty.objects.filter(similar=instance).values_list('property_id', flat=True))
+    if dependents:
+        transaction.on_commit(partial(submit_task, refresh_similarities, [], dependents))
+
+
+@receiver(post_delete, sender=Property)
+def remove_from_search_index(sender, instance, using, **kwargs):
+    search.remove_properties([instance.pk], using=using)
+
+
+@receiver(post_save, sender=PropertyImage)
+def build_image_derivatives(sender, instance, raw=False, **kwargs):
+    """
+    Resize new uploads once, before the catalogue cache is invalidated below.
+    """
+    if not raw:
+        ensure_derivatives(instance)
+
+
+@receiver(post_delete, sender=PropertyImage)
+def remove_image_derivatives(sender, instance, **kwargs):
+    delete_derivatives(instance.derivatives)
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+@receiver(post_save, sender=PropertyImage)
+@receiver(post_delete, sender=PropertyImage)
+def invalidate_catalogue_cache(sender, using, **kwargs):
+    """
+    Any change to a property or its images invalidates every cached catalogue result.
+    Bump after commit so no reader can cache the old rows under the new version.
+    """
+    transaction.on_commit(bump_catalogue_version, using=using)
+
+
+@receiver(post_save, sender=PropertyImage)
+@receiver(post_delete, sender=PropertyImage)
+def touch_property(sender, instance, using, **kwargs):
+    """
+    Image changes move the parent's updated_at so catalogue ETags change too.
+    """
+    Property.objects.using(using).filter(pk=instance.property_id).update(updated_at=timezone.now())
@@ -0,0 +1,172 @@
+"""
+"Similar plans" ranking.
+
+Every property in a category becomes a row of a NumPy feature matrix: the
+standardized numeric specs (with price and floor area on a log scale) next
+to one-hot style and feature tags. Similarity is ``1 / (1 + distance)``
+between rows. The top ``SIMILAR_LIMIT`` neighbours of each property are
+stored in SimilarProperty, rebuilt in full by ``rebuild_similarities`` and
+refreshed incrementally by ``refresh_similarities`` when a property changes.
+
+Rebuilds and refreshes run one at a time per process, and each write locks
+the Property rows it replaces neighbours for, so concurrent refreshes of the
+same property (from worker threads or other processes) queue up instead of
+both inserting a rank and failing on ``unique_similar_rank``.
+"""
+import threading
+from collections import defaultdict
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, Min
+
+from .cache import bump_catalogue_version
+from .models import Property, PropertyTag, SimilarProperty
+
+SIMILAR_LIMIT = 12
+
+NUMERIC_FIELDS = ('bedrooms', 'bathrooms', 'floor_area', 'width', 'depth', 'levels', 'price')
+LOG_FIELDS = ('floor_area', 'price')
+TAG_KINDS = ('STYLE', 'FEATURE')
+
+# Rows compared per block, bounding memory to BLOCK_SIZE x N scores
+BLOCK_SIZE = 512
+
+_lock = threading.Lock()
+
+
+class FeatureMatrix:
+    """
+    Feature rows for every property in one category.
+    """
+
+    def __init__(self, category):
+        rows = list(Property.objects.filter(category=category).order_by('pk').values_list('pk', *NUMERIC_FIELDS))
+        self.ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.index = {pk: i for i, pk in enumerate(self.ids.tolist())}
+
+        numeric = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(NUMERIC_FIELDS))
+        for column, field in enumerate(NUMERIC_FIELDS):
+            if field in LOG_FIELDS:
+                numeric[:, column] = np.log1p(np.clip(numeric[:, column], 0, None))
+        if len(rows):
+            std = numeric.std(axis=0)
+            std[std == 0] = 1.0
+            numeric = (numeric - numeric.mean(axis=0)) / std
+
+        tag_links = PropertyTag.objects.filter(
+            property__category=category, tag__kind__in=TAG_KINDS
+        ).values_list('property_id', 'tag_id')
+        tag_columns = {}
+        one_hot_cells = []
+        for property_id, tag_id in tag_links:
+            if property_id in self.index:
+                column = tag_columns.setdefault(tag_id, len(tag_columns))
+                one_hot_cells.append((self.index[property_id], column))
+        one_hot = np.zeros((len(rows), len(tag_columns)), dtype=np.float64)
+        if one_hot_cells:
+            cells = np.array(one_hot_cells)
+            one_hot[cells[:, 0], cells[:, 1]] = 1.0
+
+        self.features = np.hstack([numeric, one_hot])
+        self.norms = (self.features ** 2).sum(axis=1)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def scores(self, rows):
+        """
+        Similarity of the properties at ``rows`` (positions) to every property.
+        """
+        block = self.features[rows]
+        squared = self.norms[rows][:, None] + self.norms[None, :] - 2.0 * block @ self.features.T
+        distances = np.sqrt(np.clip(squared, 0, None))
+        scores = 1.0 / (1.0 + distances)
+        # A property is never similar to itself
+        scores[np.arange(len(rows)), rows] = -np.inf
+        return scores
+
+    def top_neighbours(self, rows):
+        """
+        Yield (property_id, [(similar_id, score), ...]) for each row position.
+        """
+        scores = self.scores(rows)
+        k = min(SIMILAR_LIMIT, len(self) - 1)
+        if k <= 0:
+            for row in rows:
+                yield int(self.ids[row]), []
+            return
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        for offset, row in enumerate(rows):
+            best = top[offset][np.argsort(-scores[offset, top[offset]])]
+            yield int(self.ids[row]), [(int(self.ids[j]), float(scores[offset, j])) for j in best]
+
+
+def _write_neighbours(neighbours):
+    neighbours = list(neighbours)
+    with transaction.atomic():
+        # Lock in pk order so two writers can't deadlock; skip rows deleted since
+        locked = set(
+            Property.objects.select_for_update().filter(pk__in=[pk for pk, _ in neighbours])
+            .order_by('pk').values_list('pk', flat=True)
+        )
+        neighbours = [(pk, ranked) for pk, ranked in neighbours if pk in locked]
+        SimilarProperty.objects.filter(property_id__in=locked).delete()
+        SimilarProperty.objects.bulk_create([
+            SimilarProperty(property_id=pk, similar_id=similar_id, score=score, rank=rank)
+            for pk, ranked in neighbours
+            for rank, (similar_id, score) in enumerate(ranked)
+        ], batch_size=1000)
+
+
+def rebuild_similarities():
+    """
+    Recompute the neighbours of every property, one block of rows at a time.
+    """
+    with _lock:
+        for category, _ in Property.CATEGORY_CHOICES:
+            matrix = FeatureMatrix(category)
+            for start in range(0, len(matrix), BLOCK_SIZE):
+                rows = np.arange(start, min(start + BLOCK_SIZE, len(matrix)))
+                _write_neighbours(matrix.top_neighbours(rows))
+    bump_catalogue_version()
+
+
+def refresh_similarities(property_ids, dependent_ids=()):
+    """
+    Incrementally refresh after ``property_ids`` changed. Only those rows are
+    recomputed, plus ``dependent_ids`` (e.g. properties that listed a deleted
+    one) and any property whose stored list contained a changed row or would
+    now admit it.
+    """
+    with _lock:
+        property_ids = set(property_ids)
+        listed_by = set(dependent_ids) | set(
+            SimilarProperty.objects.filter(similar_id__in=property_ids).values_list('property_id', flat=True)
+        )
+        # Weakest stored score and list length per property
+        stored = {
+            row['property_id']: (row['weakest'], row['count'])
+            for row in SimilarProperty.objects.values('property_id').annotate(weakest=Min('score'), count=Count('id'))
+        }
+
+        categories = defaultdict(set)
+        for pk, category in Property.objects.filter(pk__in=property_ids | listed_by).values_list('pk', 'category'):
+            categories[category].add(pk)
+
+        for category, pks in categories.items():
+            matrix = FeatureMatrix(category)
+            affected = {matrix.index[pk] for pk in pks if pk in matrix.index}
+            changed_rows = np.array([matrix.index[pk] for pk in property_ids if pk in matrix.index], dtype=np.int64)
+            if len(changed_rows):
+                best = matrix.scores(changed_rows).max(axis=0)
+                weakest = np.array([stored.get(pk, (np.inf, 0))[0] for pk in matrix.ids.tolist()])
+                counts = np.array([stored.get(pk, (np.inf, 0))[1] for pk in matrix.ids.tolist()])
+                # Lists that are short, or that a changed row now beats, need recomputing
+                stale = (counts < min(SIMILAR_LIMIT, len(matrix) - 1)) | (best > weakest)
+                affected.update(np.flatnonzero(stale).tolist())
+            affected = np.array(sorted(affected), dtype=np.int64)
+            for start in range(0, len(affected), BLOCK_SIZE):
+                _write_neighbours(matrix.top_neighbours(affected[start:start + BLOCK_SIZE]))
+
+    bump_catalogue_version()
@@ -0,0 +1,136 @@
+"""
+In-process prefix index for search-box typeahead.
+
+Style / feature tags and titles are kept in separate sorted lists of
+normalized keys, and within each the whole label is kept apart from keys
+starting at a later word ("vil" finds "Modern Villa" there). A query bisects
+to the first key with the typed prefix in each list, in that order, and
+scans forward, so tags and whole-label matches are found first no matter
+how many titles share a short prefix. The index is rebuilt when the catalogue
+version changes, and the version is read from the cache at most once per
+``VERSION_CHECK_INTERVAL`` seconds so keystrokes never wait on the cache.
+"""
+import re
+import threading
+import time
+from bisect import bisect_left
+
+from django.db.models import Count
+
+from .cache import get_catalogue_version
+from .models import Property, Tag
+
+SUGGEST_LIMIT = 8
+MAX_SUGGEST_LIMIT = 20
+
+# Keys examined per list and query, bounding the cost of very short prefixes
+MAX_CANDIDATES = 200
+
+VERSION_CHECK_INTERVAL = 1.0
+
+TAG_KINDS = {'STYLE': 'style', 'FEATURE': 'feature'}
+
+_WORD = re.compile(r'\w+')
+
+
+def normalize(text):
+    return ' '.join(_WORD.findall(str(text).casefold()))
+
+
+class SuggestIndex:
+    """
+    Sorted (key, entry) arrays over one catalogue version, in lookup order:
+    tag labels, later words of tags, title labels, later words of titles.
+    """
+
+    def __init__(self, version, entries):
+        self.version = version
+        self.entries = entries
+        self.labels = [normalize(entry['label']) for entry in entries]
+        self.tiers = []
+        for titles in (False, True):
+            whole, later = [], []
+            for position, label in enumerate(self.labels):
+                if (entries[position]['type'] == 'property') != titles:
+                    continue
+                words = label.split()
+                if words:
+                    whole.append((label, position))
+                for start in range(1, len(words)):
+                    later.append((' '.join(words[start:]), position))
+            for pairs in (whole, later):
+                pairs.sort()
+                self.tiers.append(([key for key, _ in pairs], [position for _, position in pairs]))
+
+    @classmethod
+    def build(cls, version):
+        entries = []
+        tags = (
+            Tag.objects.filter(kind__in=TAG_KINDS)
+            .annotate(weight=Count('property_tags'))
+            .filter(weight__gt=0)
+            .values_list('kind', 'name', 'slug', 'weight')
+        )
+        for kind, name, slug, weight in tags:
+            entries.append({'type': TAG_KINDS[kind], 'label': name, 'value': slug, 'weight': weight})
+        for pk, title, category in Property.objects.values_list('pk', 'title', 'category'):
+            entries.append({'type': 'property', 'label': title, 'id': pk, 'category': category, 'weight': 0})
+        return cls(version, entries)
+
+    def lookup(self, query, limit=SUGGEST_LIMIT):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        seen = set()
+        matches = []
+        # Tags before titles, labels that start with the prefix first, then most used
+        for keys, positions in self.tiers:
+            tier = []
+            index = bisect_left(keys, prefix)
+            stop = min(index + MAX_CANDIDATES, len(keys))
+            while index < stop and keys[index].startswith(prefix):
+                position = positions[index]
+                if position not in seen:
+                    seen.add(position)
+                    tier.append(position)
+                index += 1
+            tier.sort(key=lambda position: (-self.entries[position]['weight'], self.entries[position]['label']))
+            matches.extend(tier)
+            if len(matches) >= limit:
+                break
+        return [
+            {name: value for name, value in self.entries[position].items() if name != 'weight'}
+            for position in matches[:limit]
+        ]
+
+
+_index = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_suggest_index():
+    """
+    Return the index for the current catalogue version, rebuilding it if the
+    version moved since the last check.
+    """
+    global _index, _checked_at
+    index = _index
+    if index is not None and time.monotonic() - _checked_at < VERSION_CHECK_INTERVAL:
+        return index
+
+    # While another thread checks or rebuilds, keep answering from the old index
+    if not _lock.acquire(blocking=index is None):
+        return index
+    try:
+        version = get_catalogue_version()
+        if _index is None or _index.version != version:
+            _index = SuggestIndex.build(version)
+        _checked_at = time.monotonic()
+        return _index
+    finally:
+        _lock.release()
+
+
+def suggest(query, limit=SUGGEST_LIMIT):
+    return get_suggest_index().lookup(query, limit)
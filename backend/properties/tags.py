@@ -0,0 +1,76 @@
+from collections import defaultdict
+
+from django.utils.text import slugify
+
+from .models import PropertyTag, Tag
+
+# Property JSON list fields mirrored into the tag tables
+TAG_FIELDS = {
+    'styles': 'STYLE',
+    'features': 'FEATURE',
+    'amenities': 'AMENITY',
+    'floors': 'FLOOR',
+}
+
+
+def tag_slug(name):
+    return slugify(name, allow_unicode=True) or name.strip().lower()
+
+
+def _tag_names(values):
+    for value in values or []:
+        # Older floors entries are objects with a name rather than plain strings
+        if isinstance(value, dict):
+            value = value.get('name')
+        if isinstance(value, str) and value.strip():
+            yield value.strip()
+
+
+def sync_property_tags(properties, using='default'):
+    """
+    Bring the PropertyTag rows for ``properties`` in line with their JSON tag
+    lists, creating any new vocabulary entries on the way.
+    """
+    properties = list(properties)
+    if not properties:
+        return
+
+    wanted = {}
+    names = {}
+    for prop in properties:
+        keys = set()
+        for field, kind in TAG_FIELDS.items():
+            for name in _tag_names(getattr(prop, field)):
+                key = (kind, tag_slug(name))
+                keys.add(key)
+                names.setdefault(key, name)
+        wanted[prop.pk] = keys
+
+    tags = Tag.objects.using(using)
+    existing = {(t.kind, t.slug): t.pk for t in tags.filter(slug__in={slug for _, slug in names})}
+    missing = [Tag(kind=kind, slug=slug, name=names[(kind, slug)]) for kind, slug in names if (kind, slug) not in existing]
+    if missing:
+        tags.bulk_create(missing, ignore_conflicts=True)
+        existing = {(t.kind, t.slug): t.pk for t in tags.filter(slug__in={slug for _, slug in names})}
+
+    links = PropertyTag.objects.using(using)
+    current = set(links.filter(property__in=wanted).values_list('property_id', 'tag_id'))
+    desired = {(pk, existing[key]) for pk, keys in wanted.items() for key in keys}
+
+    stale = defaultdict(list)
+    for property_id, tag_id in current - desired:
+        stale[property_id].append(tag_id)
+    for property_id, tag_ids in stale.items():
+        links.filter(property_id=property_id, tag_id__in=tag_ids).delete()
+    links.bulk_create(
+        [PropertyTag(property_id=pk, tag_id=tag_id) for pk, tag_id in desired - current],
+        ignore_conflicts=True,
+    )
+
+
+def tag_vocabulary(kind):
+    """
+    Distinct tag names of ``kind``, served from the Tag table instead of
+    scanning every property's JSON.
+    """
+    return list(Tag.objects.filter(kind=kind).values_list('name', flat=True))
@@ -0,0 +1,63 @@
+"""
+Bounded in-process worker pool for slow property work (image storage and
+resizing) that should not hold a request thread.
+
+``PROPERTY_WORKERS`` sets the pool size; 0 runs tasks inline, which is what
+the tests use. At most ``PROPERTY_WORKERS * PROPERTY_TASK_QUEUE_FACTOR`` tasks
+are queued at once, after which submitters wait for a free slot.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+from config.db_router import use_primary
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor, _slots
+    with _lock:
+        if _executor is None:
+            workers = settings.PROPERTY_WORKERS
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='property-tasks')
+            _slots = threading.BoundedSemaphore(workers * settings.PROPERTY_TASK_QUEUE_FACTOR)
+        return _executor, _slots
+
+
+def _run(fn, args, kwargs):
+    try:
+        # Tasks act on rows just written by the request; don't read them from a lagging replica
+        with use_primary():
+            fn(*args, **kwargs)
+    except Exception as e:
+        print(f"Background task {fn.__name__} failed: {e}")
+    finally:
+        # Worker threads open their own connections; don't leak them
+        connections.close_all()
+
+
+def submit_task(fn, *args, **kwargs):
+    """
+    Run ``fn(*args, **kwargs)`` on the worker pool.
+    """
+    if settings.PROPERTY_WORKERS <= 0:
+        _run_inline(fn, args, kwargs)
+        return
+
+    executor, slots = _get_executor()
+    slots.acquire()
+    future = executor.submit(_run, fn, args, kwargs)
+    future.add_done_callback(lambda _: slots.release())
+
+
+def _run_inline(fn, args, kwargs):
+    try:
+        with use_primary():
+            fn(*args, **kwargs)
+    except Exception as e:
+        print(f"Background task {fn.__name__} failed: {e}")
@@ -1,3 +1,383 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from PIL import Image as PILImage
+from rest_framework.test import APIClient
+
+from config import db_router
+
+from . import counters
+from .images import spool_upload
+from .models import Property, PropertyImage
+from .suggest import SuggestIndex
+
+
+# Measure the uncached request path
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+@override_settings(CACHES=NO_CACHE, PROPERTY_WORKERS=0)
+class PropertyQueryCountTests(TestCase):
+    """
+    The catalogue endpoints must run a fixed number of queries no matter how
+    many properties (and images) they return: the ETag aggregate, the page
+    and the image prefetch.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def create_properties(self, count, category='PLAN'):
+        properties = []
+        for i in range(count):
+            prop = Property.objects.create(title=f'Plan {i}', category=category, price=1000 + i)
+            for order in range(3):
+                PropertyImage.objects.create(
+                    property=prop, image=f'property_images/plan-{i}-{order}.jpg', order=order
+                )
+            properties.append(prop)
+        return properties
+
+    def assert_constant_queries(self, url, category='PLAN'):
+        self.create_properties(1, category)
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+        self.create_properties(20, category)
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(p['cover_image'].endswith('-0.jpg') for p in response.json()['results']))
+        self.assertTrue(all(len(p['image_urls']) == 3 for p in response.json()['results']))
+
+    def test_list_query_count(self):
+        self.assert_constant_queries('/api/properties/')
+
+    def test_plans_query_count(self):
+        self.assert_constant_queries('/api/properties/plans/')
+
+    def test_built_query_count(self):
+        self.assert_constant_queries('/api/properties/built/', category='BUILT')
+
+    def test_detail_query_count(self):
+        prop = self.create_properties(1)[0]
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/properties/{prop.pk}/')
+        self.assertEqual(len(response.json()['images']), 3)
+
+
+@override_settings(CACHES=NO_CACHE, PROPERTY_WORKERS=0)
+class PropertyFilterTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.cottage = Property.objects.create(
+            title='Cottage', price=900, bedrooms=2, levels=1, styles=['Farmhouse'],
+            room_specifications=[{'name': 'Study', 'quantity': 1}],
+        )
+        self.villa = Property.objects.create(
+            title='Villa', price=2500, bedrooms=4, levels=2, styles=['Modern'], features=['Pool'],
+            room_specifications=[{'name': 'Studies', 'quantity': 2}, {'name': 'Cellar'}],
+        )
+        self.tower = Property.objects.create(title='Tower', price=4000, bedrooms=5, levels=3)
+
+    def titles(self, query):
+        response = self.client.get(f'/api/properties/?sort=price_low&{query}')
+        self.assertEqual(response.status_code, 200)
+        return [p['title'] for p in response.json()['results']]
+
+    def test_bedrooms_match_the_smallest_selection_or_more(self):
+        self.assertEqual(self.titles('bedrooms=4,5'), ['Villa', 'Tower'])
+        self.assertEqual(self.titles('bedrooms=5&bedrooms=2'), ['Cottage', 'Villa', 'Tower'])
+
+    def test_levels_match_exactly(self):
+        self.assertEqual(self.titles('levels=1,3'), ['Cottage', 'Tower'])
+
+    def test_price_range(self):
+        self.assertEqual(self.titles('price_min=1000&price_max=3000'), ['Villa'])
+
+    def test_tags_match_any_given_value(self):
+        self.assertEqual(self.titles('styles=modern,Farmhouse'), ['Cottage', 'Villa'])
+        self.assertEqual(self.titles('features=Pool'), ['Villa'])
+        self.assertEqual(self.titles('features=Modern'), [])
+
+    def test_rooms_must_all_be_present(self):
+        self.assertEqual(self.titles('room=Study Room'), ['Cottage', 'Villa'])
+        self.assertEqual(self.titles('room=study,cellar'), ['Villa'])
+        self.assertEqual(self.titles('room=study&room_min=2'), ['Villa'])
+
+    def test_bad_number_is_400(self):
+        response = self.client.get('/api/properties/?bedrooms=two')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('bedrooms', response.json())
+
+
+@override_settings(CACHES=NO_CACHE, PROPERTY_WORKERS=0)
+class PropertyConditionalGetTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.property = Property.objects.create(title='Plan', price=1000)
+
+    def test_matching_etag_returns_304_without_serializing(self):
+        response = self.client.get('/api/properties/plans/')
+        etag = response['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/properties/plans/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_when_property_changes(self):
+        etag = self.client.get(f'/api/properties/{self.property.pk}/')['ETag']
+        self.property.title = 'Renamed'
+        self.property.save()
+        response = self.client.get(f'/api/properties/{self.property.pk}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+@override_settings(PROPERTY_WORKERS=0)
+class PropertyResponseCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.property = Property.objects.create(title='Plan', price=1000)
+
+    def test_repeat_request_is_served_from_cache(self):
+        self.client.get('/api/properties/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/properties/')
+        self.assertEqual(response['X-Catalogue-Cache'], 'HIT')
+        self.assertIn('Accept', response['Vary'])
+        self.assertEqual(response.json()['results'][0]['title'], 'Plan')
+
+    def test_version_bumped_by_another_process_invalidates_cache(self):
+        self.client.get('/api/properties/')
+        # What bump_catalogue_version in a management command does to the shared file
+        path = settings.CATALOGUE_VERSION_FILE
+        later = os.stat(path).st_mtime_ns + 1
+        os.utime(path, ns=(later, later))
+        response = self.client.get('/api/properties/')
+        self.assertNotIn('X-Catalogue-Cache', response)
+
+    def test_image_change_invalidates_cache(self):
+        self.client.get('/api/properties/')
+        with self.captureOnCommitCallbacks(execute=True):
+            PropertyImage.objects.create(property=self.property, image='property_images/cover.jpg')
+        response = self.client.get('/api/properties/')
+        self.assertNotIn('X-Catalogue-Cache', response)
+        self.assertTrue(response.json()['results'][0]['cover_image'].endswith('cover.jpg'))
+
+
+@override_settings(PROPERTY_WORKERS=0)
+class PropertyCounterTests(TestCase):
+
+    def setUp(self):
+        # Start from an empty buffer that isn't due for a flush
+        counters._take_pending()
+        self.addCleanup(counters._take_pending)
+        self.properties = Property.objects.bulk_create([Property(title=f'Plan {i}', price=1000) for i in range(4)])
+
+    def test_equal_increments_share_one_update(self):
+        first, second, third, _ = self.properties
+        for prop in (first, second, third):
+            counters.record_view(prop.pk)
+        counters.record_checkout(third.pk)
+
+        # Two UPDATEs inside the flush's savepoint
+        with self.assertNumQueries(4):
+            self.assertEqual(counters.flush_counters(), 2)
+        counts = dict(Property.objects.values_list('title', 'popularity'))
+        self.assertEqual(counts, {'Plan 0': 1, 'Plan 1': 1, 'Plan 2': 1 + counters.CHECKOUT_WEIGHT, 'Plan 3': 0})
+        self.assertEqual(counters.flush_counters(), 0)
+
+    def test_failed_flush_keeps_the_counts(self):
+        prop = self.properties[0]
+        counters.record_view(prop.pk)
+        with mock.patch('django.db.models.QuerySet.update', side_effect=DatabaseError('locked')):
+            self.assertEqual(counters.flush_counters(), 0)
+        counters.record_view(prop.pk)
+
+        self.assertEqual(counters.flush_counters(), 1)
+        prop.refresh_from_db()
+        self.assertEqual((prop.view_count, prop.popularity), (2, 2))
+
+
+@mock.patch('config.db_router.catalogue_changed_within', return_value=False)
+@mock.patch('config.db_router.replica_enabled', return_value=True)
+class ReplicaRouterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.router = db_router.ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def route(self, request, write=False):
+        """
+        Run ``request`` through the pinning middleware and return where a
+        catalogue read inside the view went, and the response.
+        """
+        routed = []
+
+        def view(request):
+            if write:
+                self.router.db_for_write(Property)
+            routed.append(self.router.db_for_read(Property))
+            return HttpResponse()
+
+        response = db_router.ReplicaPinningMiddleware(view)(request)
+        return routed[0], response
+
+    def test_safe_request_reads_from_replica(self, *mocks):
+        db, response = self.route(self.factory.get('/api/properties/'))
+        self.assertEqual(db, 'replica')
+        self.assertNotIn(db_router.PIN_COOKIE, response.cookies)
+
+    def test_unsafe_method_and_primary_paths_are_pinned(self, *mocks):
+        self.assertIsNone(self.route(self.factory.post('/api/properties/'))[0])
+        self.assertIsNone(self.route(self.factory.get('/api/orders/1/'))[0])
+
+    def test_write_pins_and_sets_cookie(self, *mocks):
+        db, response = self.route(self.factory.get('/api/properties/'), write=True)
+        self.assertIsNone(db)
+        self.assertIn(db_router.PIN_COOKIE, response.cookies)
+
+    def test_cookie_pins_next_request(self, *mocks):
+        request = self.factory.get('/api/properties/')
+        request.COOKIES[db_router.PIN_COOKIE] = '1'
+        self.assertIsNone(self.route(request)[0])
+
+    def test_recent_catalogue_change_pins(self, replica_enabled, changed_within):
+        changed_within.return_value = True
+        self.assertIsNone(self.route(self.factory.get('/api/properties/'))[0])
+
+    def test_use_primary_pins_inside_a_request(self, *mocks):
+        token = db_router._begin(self.factory.get('/api/properties/'))
+        self.addCleanup(db_router._state.reset, token)
+        self.assertEqual(self.router.db_for_read(Property), 'replica')
+        with db_router.use_primary():
+            self.assertIsNone(self.router.db_for_read(Property))
+        self.assertEqual(self.router.db_for_read(Property), 'replica')
+
+    def test_reads_outside_a_request_go_to_primary(self, *mocks):
+        self.assertIsNone(self.router.db_for_read(Property))
+
+
+@override_settings(CACHES=NO_CACHE, PROPERTY_WORKERS=0)
+class PropertyPaginationTests(TestCase):
+    """
+    Following ``next`` must visit every row exactly once and then stop, even
+    when every row ties on the sort field.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        Property.objects.bulk_create([Property(title=f'Plan {i}', price=1000) for i in range(25)])
+        self.ids = set(Property.objects.values_list('pk', flat=True))
+
+    def follow(self, url, link='next'):
+        seen, pages = [], []
+        while url:
+            data = self.client.get(url).json()
+            pages.append([p['id'] for p in data['results']])
+            seen.extend(pages[-1])
+            url = data[link]
+        return seen, pages
+
+    def test_tied_rows_are_visited_once(self):
+        # Every popularity is 0 until the first counter flush
+        for sort in ('price_low', 'price_high', 'newest', 'popular'):
+            seen, _ = self.follow(f'/api/properties/?sort={sort}&page_size=7')
+            self.assertEqual(len(seen), len(self.ids), sort)
+            self.assertEqual(set(seen), self.ids, sort)
+
+    def test_previous_walks_back_over_the_same_pages(self):
+        _, pages = self.follow('/api/properties/?sort=price_low&page_size=7')
+        last = self.client.get('/api/properties/?sort=price_low&page_size=7')
+        for _ in pages[1:]:
+            last = self.client.get(last.json()['next'])
+        _, back = self.follow(last.json()['previous'], link='previous')
+        self.assertEqual(back, pages[-2::-1])
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get('/api/properties/?cursor=bogus')
+        self.assertEqual(response.status_code, 404)
+
+    def test_tied_search_ranks_are_visited_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(10):
+                Property.objects.create(title='Modern villa', price=1000)
+        ids = set(Property.objects.filter(title='Modern villa').values_list('pk', flat=True))
+        seen, _ = self.follow('/api/properties/?search=modern&page_size=4')
+        self.assertEqual(len(seen), len(ids))
+        self.assertEqual(set(seen), ids)
+
+
+@override_settings(CACHES=NO_CACHE, PROPERTY_WORKERS=0)
+class RecoverImageUploadsTests(TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        overrides = override_settings(MEDIA_ROOT=self.tmp, PROPERTY_UPLOAD_SPOOL_DIR=os.path.join(self.tmp, 'spool'))
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.property = Property.objects.create(title='Plan', price=1000)
+
+    def spool(self, image):
+        buffer = io.BytesIO()
+        PILImage.new('RGB', (40, 30), 'white').save(buffer, 'JPEG')
+        return spool_upload(SimpleUploadedFile('plan.jpg', buffer.getvalue()), image.pk)
+
+    def test_stale_uploads_are_finished_or_failed(self):
+        spooled = PropertyImage.objects.create(property=self.property, status='PENDING')
+        path = self.spool(spooled)
+        lost = PropertyImage.objects.create(property=self.property, status='PENDING')
+        orphan = self.spool(PropertyImage(pk=999999))
+
+        call_command('recover_image_uploads', older_than=0, stdout=io.StringIO())
+
+        spooled.refresh_from_db()
+        lost.refresh_from_db()
+        self.assertEqual(spooled.status, 'READY')
+        self.assertTrue(spooled.image.name.endswith('.jpg'))
+        self.assertEqual(lost.status, 'FAILED')
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(os.path.exists(orphan))
+
+    def test_recent_uploads_are_left_alone(self):
+        image = PropertyImage.objects.create(property=self.property, status='PENDING')
+        path = self.spool(image)
+        call_command('recover_image_uploads', stdout=io.StringIO())
+        image.refresh_from_db()
+        self.assertEqual(image.status, 'PENDING')
+        self.assertTrue(os.path.exists(path))
+
+
+@override_settings(PROPERTY_WORKERS=0)
+class SuggestIndexTests(TestCase):
+
+    def test_tags_come_first_on_short_prefixes(self):
+        # More matching titles than one lookup examines
+        Property.objects.bulk_create([Property(title=f'Mansion {i}', price=1000) for i in range(250)])
+        Property.objects.create(title='Cottage', price=1000, styles=['Modern'])
+
+        results = SuggestIndex.build(version=0).lookup('m', limit=3)
+        self.assertEqual(results[0], {'type': 'style', 'label': 'Modern', 'value': 'modern'})
+        self.assertEqual([r['type'] for r in results[1:]], ['property', 'property'])
+
+    def test_whole_titles_before_later_words(self):
+        Property.objects.create(title='Big Villa', price=1000)
+        Property.objects.create(title='Villa Rosa', price=1000)
+        results = SuggestIndex.build(version=0).lookup('vil')
+        self.assertEqual([r['label'] for r in results], ['Villa Rosa', 'Big Villa'])
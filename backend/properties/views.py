@@ -1,14 +1,82 @@
-from rest_framework import viewsets
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count, Max, Prefetch, Sum
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.http import StreamingHttpResponse
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from .cache import (
+    CATALOGUE_CACHE_TIMEOUT,
+    catalogue_cache_key,
+    get_cached_response,
+    response_cache_key,
+    store_response,
+)
+from .counters import record_view
+from .export import CONTENT_TYPES, EXPORT_FORMATS, export_rows
+from .facets import HISTOGRAM_BUCKETS, MAX_HISTOGRAM_BUCKETS, compute_facets, compute_histograms
+from .filters import filter_properties
 from .models import Property
-from .serializers import PropertySerializer
+from .pagination import PropertyCursorPagination
+from .search import search_properties
+from .serializers import PropertyListSerializer, PropertySerializer
+from .similarity import SIMILAR_LIMIT
+from .suggest import MAX_SUGGEST_LIMIT, SUGGEST_LIMIT, suggest
+
+# Actions that render catalogue cards with PropertyListSerializer
+LIST_ACTIONS = ('list', 'plans', 'built', 'similar')
+
+# Read actions whose rendered responses are cached per catalogue version
+CACHED_ACTIONS = ('list', 'retrieve', 'plans', 'built', 'similar', 'batch')
+
+# Most properties one batch request may ask for
+BATCH_LIMIT = 50
+
+# Paging and sorting do not change facet counts
+FACETS_IGNORED_PARAMS = ('cursor', 'page_size', 'sort')
 
 class PropertyViewSet(viewsets.ModelViewSet):
     queryset = Property.objects.all()
     serializer_class = PropertySerializer
+    pagination_class = PropertyCursorPagination
 
-    def get_queryset(self):
+    def dispatch(self, request, *args, **kwargs):
+        """
+        Serve cached read responses before any ORM or serializer work. Any
+        Property or PropertyImage change bumps the catalogue version, which
+        retires every cached entry at once.
+        """
+        action_name = self.action_map.get(request.method.lower())
+        if request.method != 'GET' or action_name not in CACHED_ACTIONS:
+            return super().dispatch(request, *args, **kwargs)
+
+        # Count detail views here so cache hits and 304s are counted too
+        lookup = str(kwargs.get(self.lookup_field, ''))
+        if action_name == 'retrieve' and lookup.isdigit():
+            record_view(lookup)
+
+        # Counter flushes don't bump the catalogue version, so popularity order is never cached
+        if request.GET.get('sort') == 'popular':
+            return super().dispatch(request, *args, **kwargs)
+
+        key = response_cache_key(request)
+        cached = get_cached_response(request, key)
+        if cached is not None:
+            return cached
+
+        response = super().dispatch(request, *args, **kwargs)
+        if hasattr(response, 'render') and not response.is_rendered:
+            response.render()
+        store_response(key, response)
+        return response
+
+    def get_base_queryset(self):
+        """
+        The catalogue narrowed by category and search, before the sidebar filters.
+        """
         queryset = Property.objects.all()
         category = self.request.query_params.get('category', None)
         search_query = self.request.query_params.get('search', None)
@@ -17,23 +85,202 @@ class PropertyViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(category=category)
             
         if search_query:
-            from django.db.models import Q
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) | 
-                Q(description__icontains=search_query) |
-                Q(styles__icontains=search_query)
-            )
+            # Full-text match, annotated with search_rank for relevance ordering
+            queryset = search_properties(queryset, search_query)
+
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action in LIST_ACTIONS:
+            return PropertyListSerializer
+        return PropertySerializer
+
+    def get_queryset(self):
+        # Prefetch images so serializing N properties costs one extra query, not N.
+        # List cards get the cover's sizes plus every image's URL for the card carousel.
+        if self.action in LIST_ACTIONS:
+            images = Prefetch('images', to_attr='card_images')
+        else:
+            images = 'images'
+        queryset = self.get_base_queryset().prefetch_related(images)
+
+        # Price, room, floor area and style filters from the filter sidebar
+        queryset = filter_properties(queryset, self.request.query_params)
             
         return queryset
 
+    def _conditional_response(self, queryset, build_response):
+        """
+        Answer If-None-Match / If-Modified-Since with a 304 when ``queryset``
+        has not changed, using only an aggregate query. Otherwise build the
+        response and attach the ETag and Last-Modified validators.
+        """
+        aggregates = {'last_modified': Max('updated_at'), 'count': Count('pk')}
+        if self.request.query_params.get('sort') == 'popular':
+            # Popularity changes without touching updated_at
+            aggregates['popularity'] = Sum('popularity')
+        stats = queryset.order_by().aggregate(**aggregates)
+        if stats['last_modified'] is None:
+            return build_response()
+
+        fingerprint = f"{stats['last_modified'].isoformat()}|{stats['count']}|{stats.get('popularity')}|{self.request.get_full_path()}"
+        etag = f'W/"{hashlib.md5(fingerprint.encode()).hexdigest()}"'
+        last_modified = int(stats['last_modified'].timestamp())
+
+        not_modified = get_conditional_response(self.request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = build_response()
+        if response.status_code == 200:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        parent = super()
+        return self._conditional_response(
+            self.get_queryset(), lambda: parent.list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        parent = super()
+        lookup = str(kwargs.get(self.lookup_field, ''))
+        if not lookup.isdigit():
+            return parent.retrieve(request, *args, **kwargs)
+        return self._conditional_response(
+            Property.objects.filter(pk=lookup), lambda: parent.retrieve(request, *args, **kwargs)
+        )
+
+    def _paginated_response(self, queryset):
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     @action(detail=False, methods=['get'])
     def plans(self, request):
         queryset = self.get_queryset().filter(category='PLAN')
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self._conditional_response(queryset, lambda: self._paginated_response(queryset))
 
     @action(detail=False, methods=['get'])
     def built(self, request):
         queryset = self.get_queryset().filter(category='BUILT')
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self._conditional_response(queryset, lambda: self._paginated_response(queryset))
+
+    @action(detail=False, methods=['get'])
+    def batch(self, request):
+        """
+        Full details of several properties (?ids=3,1,2) in the requested order,
+        for favourites and comparisons. Unknown ids are skipped.
+        """
+        ids = []
+        for raw in request.query_params.getlist('ids'):
+            for item in raw.split(','):
+                item = item.strip()
+                if not item:
+                    continue
+                if not item.isdigit():
+                    return Response({'error': f'"{item}" is not a valid id.'}, status=status.HTTP_400_BAD_REQUEST)
+                ids.append(int(item))
+        # Drop repeats, keeping the first position of each id
+        ids = list(dict.fromkeys(ids))
+        if len(ids) > BATCH_LIMIT:
+            return Response(
+                {'error': f'At most {BATCH_LIMIT} ids can be requested at once.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        def build_response():
+            found = Property.objects.prefetch_related('images').in_bulk(ids)
+            serializer = self.get_serializer([found[pk] for pk in ids if pk in found], many=True)
+            return Response(serializer.data)
+
+        return self._conditional_response(Property.objects.filter(pk__in=ids), build_response)
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """
+        Option counts and price / floor area bounds for the filter sidebar.
+        """
+        cache_key = catalogue_cache_key('facets', request.query_params, ignore=FACETS_IGNORED_PARAMS)
+        data = cache.get(cache_key)
+        if data is None:
+            data = compute_facets(self.get_base_queryset(), request.query_params)
+            cache.set(cache_key, data, CATALOGUE_CACHE_TIMEOUT)
+        return Response(data)
+
+    @action(detail=False, methods=['get'])
+    def histogram(self, request):
+        """
+        Price and floor area histograms for the range sliders (?buckets=, max 100).
+        """
+        try:
+            buckets = int(request.query_params.get('buckets', HISTOGRAM_BUCKETS))
+        except ValueError:
+            buckets = HISTOGRAM_BUCKETS
+        buckets = max(1, min(buckets, MAX_HISTOGRAM_BUCKETS))
+
+        cache_key = catalogue_cache_key(
+            'histogram', request.query_params, ignore=FACETS_IGNORED_PARAMS + ('buckets',), extra=buckets
+        )
+        data = cache.get(cache_key)
+        if data is None:
+            data = compute_histograms(self.get_base_queryset(), request.query_params, buckets)
+            cache.set(cache_key, data, CATALOGUE_CACHE_TIMEOUT)
+        return Response(data)
+
+    @action(detail=False, methods=['get'])
+    def suggest(self, request):
+        """
+        Typeahead suggestions (style / feature tags and titles) for ?q=, from the in-memory index.
+        """
+        query = request.query_params.get('q', '')
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', SUGGEST_LIMIT)), MAX_SUGGEST_LIMIT))
+        except ValueError:
+            limit = SUGGEST_LIMIT
+        return Response({'query': query, 'results': suggest(query, limit)})
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream the (optionally filtered) catalogue as NDJSON or CSV (?type=csv).
+        """
+        export_type = request.query_params.get('type', 'ndjson')
+        if export_type not in EXPORT_FORMATS:
+            return Response(
+                {'error': f'Unsupported export type "{export_type}". Use ndjson or csv.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        rows = export_rows(self.get_queryset(), request.build_absolute_uri)
+        response = StreamingHttpResponse(
+            EXPORT_FORMATS[export_type](rows), content_type=CONTENT_TYPES[export_type]
+        )
+        response['Content-Disposition'] = f'attachment; filename="properties.{export_type}"'
+        return response
+
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """
+        The most similar plans in the same category, from the precomputed neighbours.
+        """
+        prop = self.get_object()
+        # Empty until the post_save task has run (or if the category has no other
+        # property); never compute here, a read must not write or bump the version
+        links = list(prop.similar_links.values_list('similar_id', 'score'))
+
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', SIMILAR_LIMIT)), SIMILAR_LIMIT))
+        except ValueError:
+            limit = SIMILAR_LIMIT
+        links = links[:limit]
+
+        found = Property.objects.prefetch_related(Prefetch('images', to_attr='card_images')).in_bulk([similar_id for similar_id, _ in links])
+        results = []
+        for similar_id, score in links:
+            if similar_id in found:
+                data = self.get_serializer(found[similar_id]).data
+                data['similarity'] = round(score, 4)
+                results.append(data)
+        return Response(results)
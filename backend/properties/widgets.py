@@ -1,4 +1,5 @@
 from django import forms
+from django.utils.html import escape
 from django.utils.safestring import mark_safe
 import json
 
@@ -7,12 +8,15 @@ class DynamicTagWidget(forms.Widget):
     """
     Custom widget for JSON list fields with dynamic tag addition/removal.
     Users can add tags one by one using a button, or enter multiple at once.
+    When ``tag_kind`` is set, the existing vocabulary of that kind is offered
+    as autocomplete suggestions.
     """
     
     template_name = 'admin/widgets/dynamic_tag_widget.html'
     
-    def __init__(self, attrs=None, placeholder='Add a tag'):
+    def __init__(self, attrs=None, placeholder='Add a tag', tag_kind=None):
         self.placeholder = placeholder
+        self.tag_kind = tag_kind
         default_attrs = {'class': 'dynamic-tag-input'}
         if attrs:
             default_attrs.update(attrs)
@@ -39,6 +43,14 @@ class DynamicTagWidget(forms.Widget):
         # Generate unique ID for this widget
         widget_id = attrs.get('id', name)
         
+        # Suggestions come from the Tag table, not from scanning every property
+        suggestions = ''
+        if self.tag_kind:
+            from .tags import tag_vocabulary
+            suggestions = ''.join(
+                f'<option value="{escape(tag)}"></option>' for tag in tag_vocabulary(self.tag_kind)
+            )
+        
         # Build the HTML
         html = f'''
         <div class="dynamic-tag-widget" id="{widget_id}_container">
@@ -61,6 +73,7 @@ class DynamicTagWidget(forms.Widget):
                        id="{widget_id}_input" 
                        placeholder="{self.placeholder}"
                        class="vTextField tag-input-field"
+                       list="{widget_id}_suggestions"
                        onkeypress="handleTagKeyPress(event, '{widget_id}')">
                 <button type="button" 
                         class="button tag-add-btn" 
@@ -68,6 +81,7 @@ class DynamicTagWidget(forms.Widget):
                     + Add
                 </button>
             </div>
+            <datalist id="{widget_id}_suggestions">{suggestions}</datalist>
             <input type="hidden" name="{name}" id="{widget_id}" value='{json.dumps(tags)}'>
             <small class="help">Press Enter or click "+ Add" to add a tag. You can add one or multiple tags.</small>
         </div>
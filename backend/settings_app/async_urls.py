@@ -0,0 +1,13 @@
+from django.urls import path
+from . import async_views
+
+urlpatterns = [
+    path('settings/', async_views.site_settings, name='async-site-settings'),
+    path('contact-info/', async_views.contact_information, name='async-contact-info'),
+    path('team/', async_views.team_members, name='async-team'),
+    path('testimonials/', async_views.testimonials, name='async-testimonials'),
+    path('services/', async_views.services, name='async-services'),
+    path('plan-modifications/', async_views.plan_modifications, name='async-plan-modifications'),
+    path('why-trust-us/', async_views.why_trust_us, name='async-why-trust-us'),
+    path('certifications/', async_views.certifications, name='async-certifications'),
+]
@@ -0,0 +1,51 @@
+"""
+Async read-only versions of the settings endpoints for ASGI deployments.
+"""
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework.request import Request
+
+from .models import SiteSettings, ContactInformation, TeamMember, Testimonial, Service, PlanModification, WhyTrustUs, Certification
+from .serializers import (
+    SiteSettingsSerializer,
+    ContactInformationSerializer,
+    TeamMemberSerializer,
+    TestimonialSerializer,
+    ServiceSerializer,
+    PlanModificationSerializer,
+    WhyTrustUsSerializer,
+    CertificationSerializer
+)
+
+
+def singleton_view(model, serializer_class):
+    """
+    Async view returning the singleton row, or the defaults if none was saved.
+    """
+    @require_GET
+    async def view(request):
+        instance = await model.objects.afirst() or model()
+        return JsonResponse(serializer_class(instance, context={'request': Request(request)}).data)
+    return view
+
+
+def list_view(queryset, serializer_class):
+    """
+    Async view returning every row of ``queryset``.
+    """
+    @require_GET
+    async def view(request):
+        items = [item async for item in queryset.all()]
+        serializer = serializer_class(items, many=True, context={'request': Request(request)})
+        return JsonResponse(serializer.data, safe=False)
+    return view
+
+
+site_settings = singleton_view(SiteSettings, SiteSettingsSerializer)
+contact_information = singleton_view(ContactInformation, ContactInformationSerializer)
+team_members = list_view(TeamMember.objects.all(), TeamMemberSerializer)
+testimonials = list_view(Testimonial.objects.filter(is_active=True).order_by('-created_at'), TestimonialSerializer)
+services = list_view(Service.objects.filter(is_active=True), ServiceSerializer)
+plan_modifications = list_view(PlanModification.objects.all(), PlanModificationSerializer)
+why_trust_us = list_view(WhyTrustUs.objects.all(), WhyTrustUsSerializer)
+certifications = list_view(Certification.objects.all(), CertificationSerializer)
@@ -5,7 +5,7 @@ import { propertyService } from '@/services/propertyService';
 export const propertyKeys = {
     all: ['properties'] as const,
     lists: () => [...propertyKeys.all, 'list'] as const,
-    list: (category?: string) => [...propertyKeys.lists(), category] as const,
+    list: (category?: string, sort?: string) => [...propertyKeys.lists(), category, sort] as const,
     details: () => [...propertyKeys.all, 'detail'] as const,
     detail: (id: string) => [...propertyKeys.details(), id] as const,
 };
@@ -27,18 +27,18 @@ export const useProperty = (id: string) => {
     });
 };
 
-// Get house plans only
-export const useHousePlans = () => {
+// Get house plans only, optionally sorted by the server (e.g. 'popular')
+export const useHousePlans = (sort?: string) => {
     return useQuery({
-        queryKey: propertyKeys.list('plans'),
-        queryFn: () => propertyService.getPlans(),
+        queryKey: propertyKeys.list('plans', sort),
+        queryFn: () => propertyService.getPlans(sort),
     });
 };
 
-// Get built homes only
-export const useBuiltHomes = () => {
+// Get built homes only, optionally sorted by the server (e.g. 'popular')
+export const useBuiltHomes = (sort?: string) => {
     return useQuery({
-        queryKey: propertyKeys.list('built'),
-        queryFn: () => propertyService.getBuilt(),
+        queryKey: propertyKeys.list('built', sort),
+        queryFn: () => propertyService.getBuilt(sort),
     });
 };
@@ -515,7 +515,8 @@ export const BuiltHomes = () => {
   const itemsPerPage = 6;
 
   // Fetch built homes from API
-  const { data: builtHomes = [], isLoading, error } = useBuiltHomes();
+  // Popularity comes from server-side view and checkout counts, so let the API order it
+  const { data: builtHomes = [], isLoading, error } = useBuiltHomes(sortBy === 'popular' ? 'popular' : undefined);
 
   // Listen for search events from header
   useEffect(() => {
@@ -619,7 +620,7 @@ export const BuiltHomes = () => {
         filtered.sort((a, b) => a.price - b.price);
         break;
       case 'popular':
-        filtered.sort((a, b) => (b.isPopular ? 1 : 0) - (a.isPopular ? 1 : 0));
+        // Already in the API's popularity order
         break;
     }
 
@@ -374,7 +374,8 @@ export const HousePlans = () => {
   const itemsPerPage = 6;
 
   // Fetch house plans from API
-  const { data: housePlans = [], isLoading, error } = useHousePlans();
+  // Popularity comes from server-side view and checkout counts, so let the API order it
+  const { data: housePlans = [], isLoading, error } = useHousePlans(sortBy === 'popular' ? 'popular' : undefined);
 
   // Listen for search events from header
   useEffect(() => {
@@ -478,7 +479,7 @@ export const HousePlans = () => {
         filtered.sort((a, b) => a.price - b.price);
         break;
       case 'popular':
-        filtered.sort((a, b) => (b.isPopular ? 1 : 0) - (a.isPopular ? 1 : 0));
+        // Already in the API's popularity order
         break;
     }
 
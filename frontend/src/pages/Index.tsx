@@ -8,7 +8,7 @@ import { Avatar, AvatarFallback } from "@/components/ui/avatar";
 import { useState, useEffect } from "react";
 import Header from "@/components/Header";
 import { settingsService, SiteSettings, ContactInformation, Testimonial } from "@/services/settingsService";
-import { propertyService } from "@/services/propertyService";
+import { propertyService, PropertySuggestion } from "@/services/propertyService";
 import { HousePlan } from "@/types/housePlan";
 
 // HousePlanCard Component
@@ -114,6 +114,7 @@ const TestimonialCard = ({ name, role, content, rating, initials }: {
 const Index = () => {
   const navigate = useNavigate();
   const [searchQuery, setSearchQuery] = useState("");
+  const [suggestions, setSuggestions] = useState<PropertySuggestion[]>([]);
   const [settings, setSettings] = useState<SiteSettings | null>(null);
   const [contactInfo, setContactInfo] = useState<ContactInformation | null>(null);
   const [testimonials, setTestimonials] = useState<Testimonial[]>([]);
@@ -128,15 +129,14 @@ const Index = () => {
           settingsService.getSettings(),
           settingsService.getContactInfo(),
           settingsService.getTestimonials(),
-          propertyService.getAll()
+          propertyService.getPopular(7)
         ]);
 
         setSettings(settingsData);
         setContactInfo(contactData);
         setTestimonials(testimonialsData);
 
-        // For now, just slice the plans to simulate popular/best selling
-        // In a real app, you might have specific endpoints or flags
+        // The seven most popular: three featured, the next four best selling
         setPopularPlans(plansData.slice(0, 3));
         setBestSellingPlans(plansData.slice(3, 7));
       } catch (error) {
@@ -149,6 +149,27 @@ const Index = () => {
     fetchData();
   }, []);
 
+  // Typeahead: ask for suggestions shortly after the user stops typing
+  useEffect(() => {
+    const query = searchQuery.trim();
+    if (!query) {
+      setSuggestions([]);
+      return;
+    }
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      propertyService.suggest(query)
+        .then((results) => {
+          if (!cancelled) setSuggestions(results);
+        })
+        .catch(() => setSuggestions([]));
+    }, 100);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchQuery]);
+
   const handleSearch = () => {
     if (searchQuery.trim()) {
       // Navigate to house plans page with search query
@@ -197,7 +218,14 @@ const Index = () => {
                           }
                         }}
                         className="pl-10 h-12 text-base"
+                        list="search-suggestions"
+                        autoComplete="off"
                       />
+                      <datalist id="search-suggestions">
+                        {suggestions.map((suggestion) => (
+                          <option key={`${suggestion.type}-${suggestion.id ?? suggestion.value}`} value={suggestion.label} />
+                        ))}
+                      </datalist>
                     </div>
                     <Button
                       size="lg"
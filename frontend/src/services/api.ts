@@ -16,6 +16,8 @@ export const API_ENDPOINTS = {
         detail: (id: string) => `/properties/${id}/`,
         plans: '/properties/plans/',
         built: '/properties/built/',
+        suggest: '/properties/suggest/',
+        batch: '/properties/batch/',
     },
     inquiries: {
         contact: '/contact/',
@@ -5,6 +5,13 @@ export interface CheckoutResponse {
     order_id: number;
 }
 
+export type ReceiptStatus = 'ready' | 'pending' | 'failed';
+
+// Receipts are rendered in the background after payment; poll for at most this long
+const RECEIPT_POLL_TIMEOUT_MS = 60000;
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
 export const orderService = {
     async createCheckoutSession(planId: string, customerEmail?: string): Promise<CheckoutResponse> {
         const response = await api.post<CheckoutResponse>('/orders/checkout/', {
@@ -22,7 +29,20 @@ export const orderService = {
         await api.post('/orders/cancel/', { order_id: orderId });
     },
 
+    // Resolves once the receipt is ready, polling while the server reports 202 Accepted
+    async waitForReceipt(orderId: string): Promise<void> {
+        const deadline = Date.now() + RECEIPT_POLL_TIMEOUT_MS;
+        while (Date.now() < deadline) {
+            const response = await api.get<{ status: ReceiptStatus }>(`/orders/${orderId}/receipt/status/`);
+            if (response.data.status === 'ready') return;
+            const retryAfter = Number(response.headers['retry-after']) || 2;
+            await sleep(retryAfter * 1000);
+        }
+        throw new Error('Receipt is taking longer than expected. Please try again shortly.');
+    },
+
     async downloadReceipt(orderId: string): Promise<void> {
+        await orderService.waitForReceipt(orderId);
         const response = await api.get(`/orders/${orderId}/receipt/`, {
             responseType: 'blob'
         });
@@ -1,7 +1,8 @@
 import { api, API_ENDPOINTS } from './api';
 import { HousePlan } from '@/types/housePlan';
 
-// Backend response type
+// Backend response type. List endpoints return the compact card fields
+// plus cover_image and image_urls; the detail endpoint returns everything.
 interface PropertyResponse {
     id: number;
     title: string;
@@ -15,22 +16,57 @@ interface PropertyResponse {
     width: number;
     depth: number;
     styles: string[];
-    features: string[];
-    amenities: string[];
-    floors: any[];
+    features?: string[];
+    amenities?: string[];
+    floors?: any[];
     is_new: boolean;
     is_popular: boolean;
-    description: string;
+    description?: string;
     video_url: string;
-    en_suite: number;
-    lounges: number;
-    dining_areas: number;
-    garage_parking: number;
-    covered_parking: number;
-    pet_friendly: boolean;
-    image_urls: string[];
+    en_suite?: number;
+    lounges?: number;
+    dining_areas?: number;
+    garage_parking?: number;
+    covered_parking?: number;
+    pet_friendly?: boolean;
+    image_urls?: string[];
+    cover_image?: string | null;
 }
 
+// Typeahead suggestion: a style / feature tag or a property title
+export interface PropertySuggestion {
+    type: 'style' | 'feature' | 'property';
+    label: string;
+    value?: string;
+    id?: number;
+    category?: 'PLAN' | 'BUILT';
+}
+
+// Cursor-paginated list envelope
+interface PaginatedResponse<T> {
+    next: string | null;
+    previous: string | null;
+    results: T[];
+}
+
+// Largest page the backend serves (PropertyCursorPagination.max_page_size)
+const MAX_PAGE_SIZE = 100;
+
+// Follow the cursor links until every page of a list endpoint is loaded
+const fetchAllPages = async (url: string): Promise<PropertyResponse[]> => {
+    const results: PropertyResponse[] = [];
+    let nextUrl: string | null = url;
+    // The next links already carry page_size, so only the first request sets it
+    let params: { page_size: number } | undefined = { page_size: MAX_PAGE_SIZE };
+    while (nextUrl) {
+        const response = await api.get<PaginatedResponse<PropertyResponse>>(nextUrl, { params });
+        results.push(...response.data.results);
+        nextUrl = response.data.next;
+        params = undefined;
+    }
+    return results;
+};
+
 // Transform backend response to frontend format
 const transformProperty = (property: PropertyResponse): HousePlan => ({
     id: property.id.toString(),
@@ -46,7 +82,7 @@ const transformProperty = (property: PropertyResponse): HousePlan => ({
     style: property.styles,
     isNew: property.is_new,
     isPopular: property.is_popular,
-    images: property.image_urls,
+    images: property.image_urls ?? (property.cover_image ? [property.cover_image] : []),
     description: property.description,
     features: property.features,
     videoUrl: property.video_url,
@@ -63,8 +99,16 @@ const transformProperty = (property: PropertyResponse): HousePlan => ({
 export const propertyService = {
     // Get all properties
     async getAll(): Promise<HousePlan[]> {
-        const response = await api.get<PropertyResponse[]>(API_ENDPOINTS.properties.list);
-        return response.data.map(transformProperty);
+        const properties = await fetchAllPages(API_ENDPOINTS.properties.list);
+        return properties.map(transformProperty);
+    },
+
+    // Get the most viewed and bought properties, one page only
+    async getPopular(limit: number): Promise<HousePlan[]> {
+        const response = await api.get<PaginatedResponse<PropertyResponse>>(API_ENDPOINTS.properties.list, {
+            params: { sort: 'popular', page_size: limit },
+        });
+        return response.data.results.map(transformProperty);
     },
 
     // Get single property by ID
@@ -73,21 +117,40 @@ export const propertyService = {
         return transformProperty(response.data);
     },
 
-    // Get house plans only
-    async getPlans(): Promise<HousePlan[]> {
-        const response = await api.get<PropertyResponse[]>(API_ENDPOINTS.properties.plans);
+    // Get several properties in one request (favourites, comparisons), in the given order
+    async getByIds(ids: string[]): Promise<HousePlan[]> {
+        if (ids.length === 0) return [];
+        const response = await api.get<PropertyResponse[]>(API_ENDPOINTS.properties.batch, {
+            params: { ids: ids.join(',') },
+        });
         return response.data.map(transformProperty);
     },
 
-    // Get built homes only
-    async getBuilt(): Promise<HousePlan[]> {
-        const response = await api.get<PropertyResponse[]>(API_ENDPOINTS.properties.built);
-        return response.data.map(transformProperty);
+    // Get house plans only, optionally in a server-side ?sort= order
+    async getPlans(sort?: string): Promise<HousePlan[]> {
+        const query = sort ? `?sort=${encodeURIComponent(sort)}` : '';
+        const properties = await fetchAllPages(`${API_ENDPOINTS.properties.plans}${query}`);
+        return properties.map(transformProperty);
+    },
+
+    // Get built homes only, optionally in a server-side ?sort= order
+    async getBuilt(sort?: string): Promise<HousePlan[]> {
+        const query = sort ? `?sort=${encodeURIComponent(sort)}` : '';
+        const properties = await fetchAllPages(`${API_ENDPOINTS.properties.built}${query}`);
+        return properties.map(transformProperty);
     },
 
     // Search properties
     async searchProperties(query: string): Promise<HousePlan[]> {
-        const response = await api.get<PropertyResponse[]>(`${API_ENDPOINTS.properties.list}?search=${encodeURIComponent(query)}`);
-        return response.data.map(transformProperty);
+        const properties = await fetchAllPages(`${API_ENDPOINTS.properties.list}?search=${encodeURIComponent(query)}`);
+        return properties.map(transformProperty);
+    },
+
+    // Typeahead suggestions for the search box
+    async suggest(query: string): Promise<PropertySuggestion[]> {
+        const response = await api.get<{ results: PropertySuggestion[] }>(API_ENDPOINTS.properties.suggest, {
+            params: { q: query },
+        });
+        return response.data.results;
     },
 };